@@ -41,6 +41,10 @@ def correct_grid(grid, grid_correction):
     """
     Correct grid
 
+    Grids hold sub-pixel sensor positions: computations must not be done
+    below float32 precision (no float16 nor bfloat16), since corrected
+    epipolar error is expected below 0.1 pixel (see test_correct_right_grid)
+
     :param grid: grid to correct
     :type grid: CarsDataset
     :param grid_correction: grid correction to apply
@@ -154,64 +158,31 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
     matches_x2 = matches[:, 2]
     matches_y2 = matches[:, 3]
 
-    # Map real matches to sensor geometry
-    sensor_matches_raw_x = interpolate.griddata(
+    # Triangulate grid positions once, to interpolate both sensor
+    # coordinates of real and perfect matches with it
+    # (same as griddata linear interpolation, which triangulates each call)
+    epi_to_sensor = interpolate.LinearNDInterpolator(
         (np.ravel(x_values_2d), np.ravel(y_values_2d)),
-        np.ravel(source_points[:, :, 0]),
-        (matches_x2, matches_y2),
+        source_points.reshape(-1, 2),
     )
 
-    sensor_matches_raw_y = interpolate.griddata(
-        (np.ravel(x_values_2d), np.ravel(y_values_2d)),
-        np.ravel(source_points[:, :, 1]),
-        (matches_x2, matches_y2),
-    )
+    # Map real matches to sensor geometry
+    sensor_matches_raw = epi_to_sensor((matches_x2, matches_y2))
+    sensor_matches_raw_x = sensor_matches_raw[:, 0]
+    sensor_matches_raw_y = sensor_matches_raw[:, 1]
 
     # Simulate matches that have no epipolar error (i.e. y2 == y1) and map
     # them to sensor geometry
-    sensor_matches_perfect_x = interpolate.griddata(
-        (np.ravel(x_values_2d), np.ravel(y_values_2d)),
-        np.ravel(source_points[:, :, 0]),
-        (matches_x2, matches_y1),
-    )
-
-    sensor_matches_perfect_y = interpolate.griddata(
-        (np.ravel(x_values_2d), np.ravel(y_values_2d)),
-        np.ravel(source_points[:, :, 1]),
-        (matches_x2, matches_y1),
-    )
+    sensor_matches_perfect = epi_to_sensor((matches_x2, matches_y1))
+    sensor_matches_perfect_x = sensor_matches_perfect[:, 0]
+    sensor_matches_perfect_y = sensor_matches_perfect[:, 1]
 
     # Compute epipolar error in sensor geometry in both direction
     epipolar_error_x = sensor_matches_perfect_x - sensor_matches_raw_x
     epipolar_error_y = sensor_matches_perfect_y - sensor_matches_raw_y
 
     # Output epipolar error stats for monitoring
-    mean_epipolar_error = [np.mean(epipolar_error_x), np.mean(epipolar_error_y)]
-    median_epipolar_error = [
-        np.median(epipolar_error_x),
-        np.median(epipolar_error_y),
-    ]
-    std_epipolar_error = [np.std(epipolar_error_x), np.std(epipolar_error_y)]
-    rms_epipolar_error = np.mean(
-        np.sqrt(
-            epipolar_error_x * epipolar_error_x
-            + epipolar_error_y * epipolar_error_y
-        )
-    )
-    rmsd_epipolar_error = np.std(
-        np.sqrt(
-            epipolar_error_x * epipolar_error_x
-            + epipolar_error_y * epipolar_error_y
-        )
-    )
-
-    in_stats = {
-        "mean_epipolar_error": mean_epipolar_error,
-        "median_epipolar_error": median_epipolar_error,
-        "std_epipolar_error": std_epipolar_error,
-        "rms_epipolar_error": rms_epipolar_error,
-        "rmsd_epipolar_error": rmsd_epipolar_error,
-    }
+    in_stats = compute_epipolar_error_stats(epipolar_error_x, epipolar_error_y)
 
     logging.debug(
         "Epipolar error before correction: \n"
@@ -220,14 +191,14 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
         "rmse = {:.3f} +/- {:.3f} pixels \n"
         "medianx = {:.3f} pixels \n"
         "mediany = {:.3f} pixels".format(
-            mean_epipolar_error[0],
-            std_epipolar_error[0],
-            mean_epipolar_error[1],
-            std_epipolar_error[1],
-            rms_epipolar_error,
-            rmsd_epipolar_error,
-            median_epipolar_error[0],
-            median_epipolar_error[1],
+            in_stats["mean_epipolar_error"][0],
+            in_stats["std_epipolar_error"][0],
+            in_stats["mean_epipolar_error"][1],
+            in_stats["std_epipolar_error"][1],
+            in_stats["rms_epipolar_error"],
+            in_stats["rmsd_epipolar_error"],
+            in_stats["median_epipolar_error"][0],
+            in_stats["median_epipolar_error"][1],
         )
     )
 
@@ -274,17 +245,17 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
         + np.polynomial.polynomial.polyval2d(matches_x2, matches_y2, coefsy_2d)
     )
 
-    # Map corrected matches to epipolar geometry
-    epipolar_matches_corrected_x = interpolate.griddata(
+    # Map corrected matches to epipolar geometry, triangulating sensor
+    # positions once for both epipolar coordinates
+    sensor_to_epi = interpolate.LinearNDInterpolator(
         (np.ravel(source_points[:, :, 0]), np.ravel(source_points[:, :, 1])),
-        np.ravel(x_values_2d),
-        (sensor_matches_corrected_x, sensor_matches_corrected_y),
+        np.stack((np.ravel(x_values_2d), np.ravel(y_values_2d)), axis=-1),
     )
-    epipolar_matches_corrected_y = interpolate.griddata(
-        (np.ravel(source_points[:, :, 0]), np.ravel(source_points[:, :, 1])),
-        np.ravel(y_values_2d),
-        (sensor_matches_corrected_x, sensor_matches_corrected_y),
+    epipolar_matches_corrected = sensor_to_epi(
+        (sensor_matches_corrected_x, sensor_matches_corrected_y)
     )
+    epipolar_matches_corrected_x = epipolar_matches_corrected[:, 0]
+    epipolar_matches_corrected_y = epipolar_matches_corrected[:, 1]
 
     corrected_matches = np.copy(matches)
     corrected_matches[:, 2] = epipolar_matches_corrected_x
@@ -300,39 +271,10 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
     )
 
     # Output corrected epipolar error stats for monitoring
-    mean_corrected_epipolar_error = [
-        np.mean(corrected_epipolar_error_x),
-        np.mean(corrected_epipolar_error_y),
-    ]
-    median_corrected_epipolar_error = [
-        np.median(corrected_epipolar_error_x),
-        np.median(corrected_epipolar_error_y),
-    ]
-    std_corrected_epipolar_error = [
-        np.std(corrected_epipolar_error_x),
-        np.std(corrected_epipolar_error_y),
-    ]
-    rms_corrected_epipolar_error = np.mean(
-        np.sqrt(
-            corrected_epipolar_error_x * corrected_epipolar_error_x
-            + corrected_epipolar_error_y * corrected_epipolar_error_y
-        )
-    )
-    rmsd_corrected_epipolar_error = np.std(
-        np.sqrt(
-            corrected_epipolar_error_x * corrected_epipolar_error_x
-            + corrected_epipolar_error_y * corrected_epipolar_error_y
-        )
+    out_stats = compute_epipolar_error_stats(
+        corrected_epipolar_error_x, corrected_epipolar_error_y
     )
 
-    out_stats = {
-        "mean_epipolar_error": mean_corrected_epipolar_error,
-        "median_epipolar_error": median_corrected_epipolar_error,
-        "std_epipolar_error": std_corrected_epipolar_error,
-        "rms_epipolar_error": rms_corrected_epipolar_error,
-        "rmsd_epipolar_error": rmsd_corrected_epipolar_error,
-    }
-
     logging.debug(
         "Epipolar error after  correction: \n"
         "x    = {:.3f} +/- {:.3f} pixels \n"
@@ -340,14 +282,14 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
         "rmse = {:.3f} +/- {:.3f} pixels \n"
         "medianx = {:.3f} pixels \n"
         "mediany = {:.3f} pixels".format(
-            mean_corrected_epipolar_error[0],
-            std_corrected_epipolar_error[0],
-            mean_corrected_epipolar_error[1],
-            std_corrected_epipolar_error[1],
-            rms_corrected_epipolar_error,
-            rmsd_corrected_epipolar_error,
-            median_corrected_epipolar_error[0],
-            median_corrected_epipolar_error[1],
+            out_stats["mean_epipolar_error"][0],
+            out_stats["std_epipolar_error"][0],
+            out_stats["mean_epipolar_error"][1],
+            out_stats["std_epipolar_error"][1],
+            out_stats["rms_epipolar_error"],
+            out_stats["rmsd_epipolar_error"],
+            out_stats["median_epipolar_error"][0],
+            out_stats["median_epipolar_error"][1],
         )
     )
 
@@ -380,6 +322,37 @@ def estimate_right_grid_correction(matches, grid_right, initial_cars_ds=None):
     )
 
 
+def compute_epipolar_error_stats(epipolar_error_x, epipolar_error_y):
+    """
+    Compute statistics of epipolar error in sensor geometry
+
+    Both error components are stacked to compute each statistic in a single
+    call, and error norm is computed once for rms and rmsd
+
+    :param epipolar_error_x: epipolar error along x
+    :type epipolar_error_x: np.ndarray
+    :param epipolar_error_y: epipolar error along y
+    :type epipolar_error_y: np.ndarray
+
+    :return: mean, median and std of each component, mean (rms) and std
+             (rmsd) of error norm
+    :rtype: dict
+    """
+    epipolar_error = np.stack((epipolar_error_x, epipolar_error_y))
+    epipolar_error_norm = np.sqrt(
+        epipolar_error_x * epipolar_error_x
+        + epipolar_error_y * epipolar_error_y
+    )
+
+    return {
+        "mean_epipolar_error": list(np.mean(epipolar_error, axis=1)),
+        "median_epipolar_error": list(np.median(epipolar_error, axis=1)),
+        "std_epipolar_error": list(np.std(epipolar_error, axis=1)),
+        "rms_epipolar_error": np.mean(epipolar_error_norm),
+        "rmsd_epipolar_error": np.std(epipolar_error_norm),
+    }
+
+
 def create_matches_cars_ds(corrected_matches, initial_cars_ds):
     """
     Create CarsDataset representing matches, from numpy matches.
@@ -342,6 +342,12 @@ class MappingToTerrainTiles(
                 list_points_min.append(points_min)
                 list_points_max.append(points_max)
 
+            # Stack pairs positions once, to process all pairs at once
+            # for each terrain tile
+            epipolar_points = tiling.stack_epipolar_points(
+                list_points_min, list_points_max
+            )
+
             # Add infos to orchestrator.out_json
             updating_dict = {
                 application_constants.APPLICATION_TAG: {
@@ -387,8 +393,7 @@ class MappingToTerrainTiles(
                         col,
                         list_epipolar_points_cloud_left,
                         list_epipolar_points_cloud_right,
-                        list_points_min,
-                        list_points_max,
+                        epipolar_points,
                     )
 
                     if len(required_point_clouds_left) > 0:
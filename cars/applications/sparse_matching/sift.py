@@ -567,13 +567,20 @@ class Sift(SparseMatching, short_name="sift"):
         epipolar_error_upper_bound = self.epipolar_error_upper_bound
         epipolar_error_maximum_bias = self.epipolar_error_maximum_bias
 
-        # Compute grid correction
-        # TODO to remove
-        cars_orchestrator.add_to_replace_lists(
-            epipolar_matches_left, cars_ds_name="epi_matches_left"
-        )
-        # Run cluster breakpoint
-        cars_orchestrator.breakpoint()
+        # Matches may already be computed, by a breakpoint shared between
+        # several pairs
+        if not all(
+            tile is None or isinstance(tile, pandas.DataFrame)
+            for tiles_row in epipolar_matches_left.tiles
+            for tile in tiles_row
+        ):
+            # Compute grid correction
+            # TODO to remove
+            cars_orchestrator.add_to_replace_lists(
+                epipolar_matches_left, cars_ds_name="epi_matches_left"
+            )
+            # Run cluster breakpoint
+            cars_orchestrator.breakpoint()
 
         # epipolar_matches_left is now filled with readable data
 
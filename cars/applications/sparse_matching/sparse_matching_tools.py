@@ -117,17 +117,20 @@ def remove_epipolar_outliers(matches, percent=0.1):
     :return: the filtered match array
     :rtype: numpy array
     """
-    epipolar_error_min = np.percentile(matches[:, 1] - matches[:, 3], percent)
-    epipolar_error_max = np.percentile(
-        matches[:, 1] - matches[:, 3], 100 - percent
+    # Compute epipolar error once, and both quantiles in a single call
+    epipolar_error = matches[:, 1] - matches[:, 3]
+    epipolar_error_min, epipolar_error_max = np.percentile(
+        epipolar_error, [percent, 100 - percent]
     )
     logging.info(
         "Epipolar error range after outlier rejection: [{},{}]".format(
             epipolar_error_min, epipolar_error_max
         )
     )
-    out = matches[(matches[:, 1] - matches[:, 3]) < epipolar_error_max]
-    out = out[(out[:, 1] - out[:, 3]) > epipolar_error_min]
+    out = matches[
+        (epipolar_error < epipolar_error_max)
+        & (epipolar_error > epipolar_error_min)
+    ]
 
     return out
 
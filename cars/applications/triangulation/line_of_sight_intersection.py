@@ -572,8 +572,7 @@ def compute_points_cloud(
     im_ref_msk = None
     im_sec_msk = None
     if add_msk_info:
-        ref_values_list = [key for key, _ in left.items()]
-        if cst.EPI_MSK in ref_values_list:
+        if cst.EPI_MSK in left:
             im_ref_msk = left
         else:
             worker_logger = logging.getLogger("distributed.worker")
@@ -581,8 +580,7 @@ def compute_points_cloud(
                 "Left image does not have a mask to rasterize"
             )
         if disp_sec is not None:
-            sec_values_list = [key for key, _ in right.items()]
-            if cst.EPI_MSK in sec_values_list:
+            if cst.EPI_MSK in right:
                 im_sec_msk = right
             else:
                 worker_logger = logging.getLogger("distributed.worker")
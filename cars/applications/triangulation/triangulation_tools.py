@@ -30,6 +30,7 @@ from typing import Dict
 # Third party imports
 import numpy as np
 import xarray as xr
+from scipy import ndimage
 
 from cars.conf import input_parameters
 from cars.core import constants as cst
@@ -258,10 +259,14 @@ def compute_points_cloud(
     row = np.array(range(data.attrs[roi_key][1], data.attrs[roi_key][3]))
     col = np.array(range(data.attrs[roi_key][0], data.attrs[roi_key][2]))
 
+    # move the channel axis first so that each of the longitude, latitude
+    # and elevation layers is a contiguous (row, col) block
+    llh = np.ascontiguousarray(np.moveaxis(llh, -1, 0))
+
     values = {
-        cst.X: ([cst.ROW, cst.COL], llh[:, :, 0]),  # longitudes
-        cst.Y: ([cst.ROW, cst.COL], llh[:, :, 1]),  # latitudes
-        cst.Z: ([cst.ROW, cst.COL], llh[:, :, 2]),
+        cst.X: ([cst.ROW, cst.COL], llh[0]),  # longitudes
+        cst.Y: ([cst.ROW, cst.COL], llh[1]),  # latitudes
+        cst.Z: ([cst.ROW, cst.COL], llh[2]),
         cst.POINTS_CLOUD_CORR_MSK: (
             [cst.ROW, cst.COL],
             data[cst.DISP_MSK].values,
@@ -269,9 +274,7 @@ def compute_points_cloud(
     }
 
     if dataset_msk is not None:
-        ds_values_list = [key for key, _ in dataset_msk.items()]
-
-        if cst.EPI_MSK in ds_values_list:
+        if cst.EPI_MSK in dataset_msk:
             if roi_key == cst.ROI_WITH_MARGINS:
                 ref_roi = [
                     0,
@@ -300,30 +303,19 @@ def compute_points_cloud(
             worker_logger = logging.getLogger("distributed.worker")
             worker_logger.warning("No mask is present in the image dataset")
 
-    point_cloud = xr.Dataset(values, coords={cst.ROW: row, cst.COL: col})
-
     # add color
-    nb_bands = 1
     if cst.EPI_COLOR in data:
         color = data[cst.EPI_COLOR].values
-        if len(color.shape) > 2:
-            nb_bands = color.shape[0]
-            if nb_bands == 1:
-                color = color[0, :, :]
-
-        if nb_bands > 1:
-            if cst.BAND not in point_cloud.dims:
-                point_cloud.assign_coords({cst.BAND: np.arange(nb_bands)})
+        if len(color.shape) > 2 and color.shape[0] == 1:
+            color = color[0, :, :]
 
-            point_cloud[cst.EPI_COLOR] = xr.DataArray(
-                color,
-                dims=[cst.BAND, cst.ROW, cst.COL],
-            )
+        if len(color.shape) > 2:
+            values[cst.EPI_COLOR] = ([cst.BAND, cst.ROW, cst.COL], color)
         else:
-            point_cloud[cst.EPI_COLOR] = xr.DataArray(
-                color,
-                dims=[cst.ROW, cst.COL],
-            )
+            values[cst.EPI_COLOR] = ([cst.ROW, cst.COL], color)
+
+    # build the point cloud dataset at once, with all its variables
+    point_cloud = xr.Dataset(values, coords={cst.ROW: row, cst.COL: col})
 
     point_cloud.attrs[cst.ROI] = data.attrs[cst.ROI]
     if roi_key == cst.ROI_WITH_MARGINS:
@@ -349,40 +341,53 @@ def geoid_offset(points, geoid):
     :rtype: xarray.Dataset
     """
 
-    # deep copy the given point cloud that will be used as output
-    out_pc = points.copy(deep=True)
+    # shallow copy the given point cloud that will be used as output:
+    # only the elevation is replaced, so the other arrays (X, Y, masks,
+    # color) are shared with the input and not duplicated
+    out_pc = points.copy(deep=False)
 
     # currently assumes that the OTB EGM96 geoid will be used with longitude
     # ranging from 0 to 360, so we must unwrap longitudes to this range.
     longitudes = np.copy(out_pc[cst.X].values)
     longitudes[longitudes < 0] += 360
 
+    # compute point cloud extent directly on numpy arrays, NaN values
+    # are ignored for latitudes as done by xarray reductions
+    latitudes = out_pc[cst.Y].values
+    lat_min, lat_max = np.nanmin(latitudes), np.nanmax(latitudes)
+    lon_min, lon_max = np.min(longitudes), np.max(longitudes)
+
     # perform interpolation using point cloud coordinates.
     if (
-        not geoid.lat_min
-        <= out_pc[cst.Y].min()
-        <= out_pc[cst.Y].max()
-        <= geoid.lat_max
-        and geoid.lon_min
-        <= np.min(longitudes)
-        <= np.max(longitudes)
-        <= geoid.lat_max
+        not geoid.lat_min <= lat_min <= lat_max <= geoid.lat_max
+        and geoid.lon_min <= lon_min <= lon_max <= geoid.lat_max
     ):
         raise RuntimeError(
             "Geoid does not fully cover the area spanned by the point cloud."
         )
 
-    # interpolate data
-    ref_interp = geoid.interp(
-        {
-            "lat": out_pc[cst.Y],
-            "lon": xr.DataArray(longitudes, dims=(cst.ROW, cst.COL)),
-        }
+    # interpolate data: the geoid is defined on a regular grid, so the
+    # point cloud coordinates are directly converted to fractional indices
+    # in this grid and bilinearly interpolated, points outside the grid
+    # getting NaN heights
+    geoid_lat = geoid["lat"].values
+    geoid_lon = geoid["lon"].values
+    lat_idx = (latitudes - geoid_lat[0]) / (geoid_lat[1] - geoid_lat[0])
+    lon_idx = (longitudes - geoid_lon[0]) / (geoid_lon[1] - geoid_lon[0])
+    ref_interp = ndimage.map_coordinates(
+        geoid["hgt"].values,
+        np.stack([lat_idx.ravel(), lon_idx.ravel()]),
+        order=1,
+        mode="constant",
+        cval=np.nan,
+    ).reshape(latitudes.shape)
+
+    # offset using geoid height, directly on numpy arrays to skip xarray
+    # coordinates alignment
+    out_pc[cst.Z] = xr.DataArray(
+        np.subtract(points[cst.Z].values, ref_interp),
+        dims=points[cst.Z].dims,
+        coords=points[cst.Z].coords,
     )
-    # offset using geoid height
-    out_pc[cst.Z] = points[cst.Z] - ref_interp.hgt
-
-    # remove coordinates lat & lon added by the interpolation
-    out_pc = out_pc.reset_coords(["lat", "lon"], drop=True)
 
     return out_pc
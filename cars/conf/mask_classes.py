@@ -24,7 +24,6 @@ CARS mask classes module
 
 # Standard imports
 import logging
-import warnings
 from typing import List
 
 # Third party imports
@@ -56,10 +55,10 @@ def check_mask_classes(mask_classes_dict: dict):
     """
 
     # check that required values are not protected for CARS internal usage
-    used_values = []
+    used_values = set()
     for key in mask_classes_dict.keys():
         if mask_classes_dict[key] is not None:
-            used_values.extend(mask_classes_dict[key])
+            used_values.update(mask_classes_dict[key])
 
     for i in PROTECTED_VALUES:
         if i in used_values:
@@ -79,27 +78,17 @@ def is_multiclasses_mask(msk: np.ndarray) -> bool:
     :param msk: mask to test
     :return: True if the mask has several classes, False otherwise
     """
-    # search the locations of valid values in the mask
-    msk_classes = np.where(msk == VALID_VALUE, True, False)
+    # discard the valid and protected values of the mask
+    msk_only_classes = msk[~np.isin(msk, [VALID_VALUE] + PROTECTED_VALUES)]
+    if np.issubdtype(msk_only_classes.dtype, np.floating):
+        msk_only_classes = msk_only_classes[~np.isnan(msk_only_classes)]
 
-    # update with the locations of the protected values in the mask
-    for i in PROTECTED_VALUES:
-        msk_classes = np.logical_or(
-            msk_classes, np.where(msk == i, True, False)
-        )
-
-    # set these location to nan in order to discard them
-    msk_only_classes = msk.astype(np.float64)
-    msk_only_classes[msk_classes] = np.nan
-
-    # check if mask has several classes
-    with warnings.catch_warnings():
-        warnings.filterwarnings(
-            action="ignore", message="All-NaN slice encountered"
-        )
-        res = bool(np.nanmin(msk_only_classes) != np.nanmax(msk_only_classes))
+    # check if mask has several classes, i.e. if any class differs from
+    # the first one, without sorting the mask values
+    if msk_only_classes.size == 0:
+        return False
 
-    return res
+    return bool(np.any(msk_only_classes != msk_only_classes[0]))
 
 
 def create_msk_from_classes(
@@ -126,30 +115,21 @@ def create_msk_from_classes(
     :param out_msk_dtype: numpy dtype of the output mask
     :return: the output mask
     """
-    # initiate the required classes final mask
-    if out_msk_dtype == bool:
-        not_msk_pix_value = False
-    else:
-        not_msk_pix_value = 0
-    out_msk = np.full(
-        mc_msk.shape, fill_value=not_msk_pix_value, dtype=out_msk_dtype
-    )
-
-    # create boolean mask with the pixels of the required classes as True
-    msk_with_selected_classes = np.zeros(mc_msk.shape, dtype=bool)
-
-    for i in classes_to_use:
-        msk_with_selected_classes = np.logical_or(
-            msk_with_selected_classes, np.where(mc_msk == i, True, False)
-        )
-
     # if intern nodata must be masked
     if mask_intern_no_data_val:
-        msk_with_selected_classes = np.logical_or(
-            msk_with_selected_classes,
-            np.where(mc_msk == NO_DATA_IN_EPIPOLAR_RECTIFICATION, True, False),
-        )
+        classes_to_use = list(classes_to_use) + [
+            NO_DATA_IN_EPIPOLAR_RECTIFICATION
+        ]
+
+    # create boolean mask with the pixels of the required classes as True,
+    # in a single pass over the multi-classes mask
+    msk_with_selected_classes = np.isin(mc_msk, classes_to_use)
 
+    if out_msk_dtype == bool:
+        return msk_with_selected_classes
+
+    # initiate the required classes final mask
+    out_msk = np.zeros(mc_msk.shape, dtype=out_msk_dtype)
     out_msk[msk_with_selected_classes] = out_msk_pix_value
 
     return out_msk
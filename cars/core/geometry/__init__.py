@@ -300,23 +300,22 @@ class AbstractGeometry(metaclass=ABCMeta):
                  the 'y' coordinate (last index set to 1).
         """
 
-        # open epipolar grid
-        ds_grid = rio.open(grid)
+        # open epipolar grid, reading both bands at once
+        with rio.open(grid) as ds_grid:
+            transform = ds_grid.transform
+            width = ds_grid.width
+            height = ds_grid.height
+            col_dep, row_dep = ds_grid.read((1, 2))
 
         # retrieve grid step
-        transform = ds_grid.transform
         step_col = transform[0]
         step_row = transform[4]
 
         # center-pixel positions
         [ori_col, ori_row] = transform * (0.5, 0.5)
 
-        last_col = ori_col + step_col * ds_grid.width
-        last_row = ori_row + step_row * ds_grid.height
-
-        # transform dep to positions
-        row_dep = ds_grid.read(2)
-        col_dep = ds_grid.read(1)
+        last_col = ori_col + step_col * width
+        last_row = ori_row + step_row * height
 
         cols = np.arange(ori_col, last_col, step_col)
         rows = np.arange(ori_row, last_row, step_row)
@@ -326,6 +325,8 @@ class AbstractGeometry(metaclass=ABCMeta):
         grid_row, grid_col = np.mgrid[
             ori_row:last_row:step_row, ori_col:last_col:step_col
         ]
+
+        # transform dep to positions
         sensor_row_positions = row_dep + grid_row
         sensor_col_positions = col_dep + grid_col
 
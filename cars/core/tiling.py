@@ -27,15 +27,17 @@ import logging
 
 # Standard imports
 import math
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 # Third party imports
 import numpy as np
+import shapely
 from osgeo import osr
 from scipy.spatial import Delaunay  # pylint: disable=no-name-in-module
 from scipy.spatial import cKDTree  # pylint: disable=no-name-in-module
 from scipy.spatial import tsearch  # pylint: disable=no-name-in-module
-from shapely.geometry import box, mapping
+from shapely.geometry import mapping
 from shapely.geometry.multipolygon import MultiPolygon
 
 from cars.applications.grid_generation import grids
@@ -45,7 +47,13 @@ from cars.core import former_confs_utils
 
 
 def grid(
-    xmin: float, ymin: float, xmax: float, ymax: float, xsplit: int, ysplit: int
+    xmin: float,
+    ymin: float,
+    xmax: float,
+    ymax: float,
+    xsplit: int,
+    ysplit: int,
+    out: np.ndarray = None,
 ) -> np.ndarray:
     """
     Generate grid of positions by splitting [xmin, xmax]x[ymin, ymax]
@@ -57,6 +65,9 @@ def grid(
     :param ymax : ymax of the bounding box of the region to split
     :param xsplit: width of splits
     :param ysplit: height of splits
+    :param out: optional float array of shape
+                (nb_ysplits + 1, nb_xsplits + 1, 2) to fill, allocated
+                if not given
 
     :return: The output ndarray grid with nb_ysplits splits in first direction
              and nb_xsplits in second direction for 2 dimensions 0:x, 1:y
@@ -65,14 +76,21 @@ def grid(
     nb_xsplits = math.ceil((xmax - xmin) / xsplit)
     nb_ysplits = math.ceil((ymax - ymin) / ysplit)
 
-    out_grid = np.ndarray(
-        shape=(nb_ysplits + 1, nb_xsplits + 1, 2), dtype=float
-    )
+    out_grid = out
+    if out_grid is None:
+        out_grid = np.empty((nb_ysplits + 1, nb_xsplits + 1, 2), dtype=float)
 
-    for i in range(0, nb_xsplits + 1):
-        for j in range(0, nb_ysplits + 1):
-            out_grid[j, i, 0] = min(xmax, xmin + i * xsplit)
-            out_grid[j, i, 1] = min(ymax, ymin + j * ysplit)
+    # positions along each axis, broadcast over the whole grid
+    np.minimum(
+        xmax,
+        xmin + np.arange(nb_xsplits + 1)[np.newaxis, :] * xsplit,
+        out=out_grid[:, :, 0],
+    )
+    np.minimum(
+        ymax,
+        ymin + np.arange(nb_ysplits + 1)[:, np.newaxis] * ysplit,
+        out=out_grid[:, :, 1],
+    )
 
     return out_grid
 
@@ -102,23 +120,28 @@ def split(xmin, ymin, xmax, ymax, xsplit, ysplit):
     nb_xsplits = math.ceil((xmax - xmin) / xsplit)
     nb_ysplits = math.ceil((ymax - ymin) / ysplit)
 
-    terrain_regions = []
-
-    for i in range(0, nb_xsplits):
-        for j in range(0, nb_ysplits):
-            region = [
-                xmin + i * xsplit,
-                ymin + j * ysplit,
-                xmin + (i + 1) * xsplit,
-                ymin + (j + 1) * ysplit,
-            ]
+    # split indices, x major to keep regions order
+    idx_x, idx_y = np.meshgrid(
+        np.arange(nb_xsplits), np.arange(nb_ysplits), indexing="ij"
+    )
+    idx_x = idx_x.ravel()
+    idx_y = idx_y.ravel()
 
-            # Crop to largest region
-            region = crop(region, [xmin, ymin, xmax, ymax])
+    terrain_regions = np.stack(
+        [
+            xmin + idx_x * xsplit,
+            ymin + idx_y * ysplit,
+            xmin + (idx_x + 1) * xsplit,
+            ymin + (idx_y + 1) * ysplit,
+        ],
+        axis=-1,
+    ).astype(float)
 
-            terrain_regions.append(region)
+    # Crop to largest region
+    terrain_regions[:, 0::2] = np.clip(terrain_regions[:, 0::2], xmin, xmax)
+    terrain_regions[:, 1::2] = np.clip(terrain_regions[:, 1::2], ymin, ymax)
 
-    return terrain_regions
+    return terrain_regions.tolist()
 
 
 def crop(region1, region2):
@@ -131,17 +154,16 @@ def crop(region1, region2):
            as an array [xmin, ymin, xmax, ymax]
     :type region2: list of four float
 
-    :return: The cropped regiona as an array [xmin, ymin, xmax, ymax].
+    :return: The cropped regiona as a tuple (xmin, ymin, xmax, ymax).
              If region1 is outside region2, might result in inconsistent region
-    :rtype: list of four float
+    :rtype: tuple of four float
     """
-    out = region1[:]
-    out[0] = min(region2[2], max(region2[0], region1[0]))
-    out[2] = min(region2[2], max(region2[0], region1[2]))
-    out[1] = min(region2[3], max(region2[1], region1[1]))
-    out[3] = min(region2[3], max(region2[1], region1[3]))
-
-    return out
+    return (
+        min(region2[2], max(region2[0], region1[0])),
+        min(region2[3], max(region2[1], region1[1])),
+        min(region2[2], max(region2[0], region1[2])),
+        min(region2[3], max(region2[1], region1[3])),
+    )
 
 
 def pad(region, margins):
@@ -153,15 +175,14 @@ def pad(region, margins):
     :param margins: Margin to add
     :type margins: list of four floats
     :return: padded region
-    :rtype: list of four float
+    :rtype: tuple of four float
     """
-    out = region[:]
-    out[0] -= margins[0]
-    out[1] -= margins[1]
-    out[2] += margins[2]
-    out[3] += margins[3]
-
-    return out
+    return (
+        region[0] - margins[0],
+        region[1] - margins[1],
+        region[2] + margins[2],
+        region[3] + margins[3],
+    )
 
 
 def empty(region):
@@ -210,6 +231,30 @@ def list_tiles(region, largest_region, tile_size, margin=1):
     :return: A list of tiles as dicts containing idx and idy
     :rtype: list of dict
     """
+    return [
+        {"idx": tile_idx_x, "idy": tile_idx_y, "tile": list(tile)}
+        for tile_idx_x, tile_idx_y, tile in list_tiles_cached(
+            tuple(region), tuple(largest_region), tile_size, margin
+        )
+    ]
+
+
+@lru_cache(maxsize=4096)
+def list_tiles_cached(
+    region: Tuple, largest_region: Tuple, tile_size: int, margin: int
+) -> Tuple:
+    """
+    Cached implementation of list_tiles: the same regions are requested
+    for many terrain tiles when pairing them with epipolar tiles.
+    Tiles are returned as immutable tuples so that cached results
+    can not be modified by callers.
+
+    :param region: The region to list intersecting tiles
+    :param largest_region: The region to split
+    :param tile_size: Width of tiles for splitting (squared tiles)
+    :param margin: Also include margin neighboring tiles
+    :return: tiles as (idx, idy, tile) tuples
+    """
     # Find tile indices covered by region
     min_tile_idx_x = int(math.floor(region[0] / tile_size))
     max_tile_idx_x = int(math.ceil(region[2] / tile_size))
@@ -222,28 +267,42 @@ def list_tiles(region, largest_region, tile_size, margin=1):
     max_tile_idx_x += margin
     max_tile_idx_y += margin
 
-    out = []
-
-    # Loop on tile idx
-    for tile_idx_x in range(min_tile_idx_x, max_tile_idx_x):
-        for tile_idx_y in range(min_tile_idx_y, max_tile_idx_y):
-
-            # Derive tile coordinates
-            tile = [
-                tile_idx_x * tile_size,
-                tile_idx_y * tile_size,
-                (tile_idx_x + 1) * tile_size,
-                (tile_idx_y + 1) * tile_size,
-            ]
+    # Tile indices, x major to keep tiles order
+    tiles_idx_x, tiles_idx_y = np.meshgrid(
+        np.arange(min_tile_idx_x, max_tile_idx_x),
+        np.arange(min_tile_idx_y, max_tile_idx_y),
+        indexing="ij",
+    )
+    tiles_idx_x = tiles_idx_x.ravel()
+    tiles_idx_y = tiles_idx_y.ravel()
 
-            # Crop to largest region
-            tile = crop(tile, largest_region)
+    # Derive tiles coordinates, cropped to largest region
+    tiles = np.stack(
+        [
+            tiles_idx_x * tile_size,
+            tiles_idx_y * tile_size,
+            (tiles_idx_x + 1) * tile_size,
+            (tiles_idx_y + 1) * tile_size,
+        ],
+        axis=-1,
+    ).astype(float)
+    tiles[:, 0::2] = np.minimum(
+        largest_region[2], np.maximum(largest_region[0], tiles[:, 0::2])
+    )
+    tiles[:, 1::2] = np.minimum(
+        largest_region[3], np.maximum(largest_region[1], tiles[:, 1::2])
+    )
 
-            # Check if tile is empty
-            if not empty(tile):
-                out.append({"idx": tile_idx_x, "idy": tile_idx_y, "tile": tile})
+    # Keep non empty tiles
+    not_empty = (tiles[:, 0] < tiles[:, 2]) & (tiles[:, 1] < tiles[:, 3])
 
-    return out
+    return tuple(
+        zip(
+            tiles_idx_x[not_empty].tolist(),
+            tiles_idx_y[not_empty].tolist(),
+            map(tuple, tiles[not_empty].tolist()),
+        )
+    )
 
 
 def roi_to_start_and_size(region, resolution):
@@ -263,8 +322,8 @@ def roi_to_start_and_size(region, resolution):
     """
     xstart = region[0]
     ystart = region[3]
-    xsize = int(np.round((region[2] - region[0]) / resolution))
-    ysize = int(np.round((region[3] - region[1]) / resolution))
+    xsize = int(round((region[2] - region[0]) / resolution))
+    ysize = int(round((region[3] - region[1]) / resolution))
 
     return xstart, ystart, xsize, ysize
 
@@ -373,30 +432,31 @@ def terrain_region_to_epipolar(
     s_min = tsearch(tri_min, region_grid)
     s_max = tsearch(tri_max, region_grid)
 
-    points_list = []
-    # For each corner
-    for i in range(0, 4):
-        # If we are inside triangulation of s_min
-        if s_min[i] != -1:
-            # Add points from surrounding triangle
-            for point in epi_grid_flat[tri_min.simplices[s_min[i]]]:
-                points_list.append(point)
-        else:
-            # else add nearest neighbor
-            __, point_idx = tree_min.query(region_grid[i, :])
-            points_list.append(epi_grid_flat[point_idx])
-            # If we are inside triangulation of s_min
-            if s_max[i] != -1:
-                # Add points from surrounding triangle
-                for point in epi_grid_flat[tri_max.simplices[s_max[i]]]:
-                    points_list.append(point)
-            else:
-                # else add nearest neighbor
-                __, point_nn_idx = tree_max.query(region_grid[i, :])
-                points_list.append(epi_grid_flat[point_nn_idx])
-
-    points_min = np.min(points_list, axis=0)
-    points_max = np.max(points_list, axis=0)
+    # Corners inside triangulation of s_min:
+    # add points from surrounding triangles
+    inside_min = s_min != -1
+    min_simplices = tri_min.simplices[s_min[inside_min]]
+    points_list = [epi_grid_flat[min_simplices].reshape(-1, 2)]
+
+    # Other corners: add nearest neighbors, and points from surrounding
+    # triangles of s_max, or nearest neighbors if outside triangulation
+    outside_min = ~inside_min
+    if np.any(outside_min):
+        outside_region_grid = region_grid[outside_min]
+        __, points_idx = tree_min.query(outside_region_grid)
+        points_list.append(epi_grid_flat[points_idx])
+
+        outside_s_max = s_max[outside_min]
+        inside_max = outside_s_max != -1
+        max_simplices = tri_max.simplices[outside_s_max[inside_max]]
+        points_list.append(epi_grid_flat[max_simplices].reshape(-1, 2))
+        if not np.all(inside_max):
+            __, points_nn_idx = tree_max.query(outside_region_grid[~inside_max])
+            points_list.append(epi_grid_flat[points_nn_idx])
+
+    points = np.concatenate(points_list)
+    points_min = np.min(points, axis=0)
+    points_max = np.max(points, axis=0)
 
     # Bounding region of corresponding cell
     epipolar_region_minx = points_min[0]
@@ -415,6 +475,32 @@ def terrain_region_to_epipolar(
     return epipolar_region
 
 
+def get_simplices_on_the_edges(original_grid_shape: Tuple, tri: Delaunay):
+    """
+    Get mask of simplices on the edges, which allows to cut triangles out of
+    the concave Delaunay triangulation.
+
+    :param original_grid_shape: shape of the original grid (almost regular) used
+           to create delaunay triangulation
+    :param tri: Delaunay triangulation
+    :return: boolean mask of the triangulation simplices, True if the simplex
+             is on the edges
+    """
+
+    # Position in the original grid of the simplices vertices
+    nb_rows, nb_cols = original_grid_shape
+    vertices_rows, vertices_cols = np.divmod(tri.simplices, nb_cols)
+
+    # simplices filtered if all points are on the same edge:
+    # left, bottom, right, top
+    return (
+        np.all(vertices_cols == 0, axis=1)
+        | np.all(vertices_rows == nb_rows - 1, axis=1)
+        | np.all(vertices_cols == nb_cols - 1, axis=1)
+        | np.all(vertices_rows == 0, axis=1)
+    )
+
+
 def filter_simplices_on_the_edges(
     original_grid_shape: Tuple, tri: Delaunay, simplices: np.ndarray
 ):
@@ -428,21 +514,53 @@ def filter_simplices_on_the_edges(
     :param simplices: Selected simplices to filter: set -1 if selected simplex
            is on the edges
     """
+    edges_simplices = get_simplices_on_the_edges(original_grid_shape, tri)
+    simplices[edges_simplices[simplices]] = -1
 
-    # Filter simplices on the edges
-    edges = np.zeros((4, *original_grid_shape))
 
-    # left, bottom, right, top
-    edges[0, :, 0] = 1
-    edges[1, -1, :] = 1
-    edges[2, :, -1] = 1
-    edges[3, 0, :] = 1
+def get_precision_factor(epsg: int) -> float:
+    """
+    Get factor applied to positions to increase the precision of the
+    spatial look-ups, in geographic coordinates
+
+    :param epsg: epsg code of the terrain grid
+    :return: precision factor
+    """
+    spatial_ref = osr.SpatialReference()
+    spatial_ref.ImportFromEPSG(epsg)
+    if spatial_ref.IsGeographic():
+        return 1000.0
+    return 1.0
+
+
+def build_spatial_structures(
+    epipolar_grid_min: np.ndarray,
+    epipolar_grid_max: np.ndarray,
+    epsg: int,
+) -> Tuple[Delaunay, Delaunay, cKDTree, cKDTree]:
+    """
+    Build Delaunay triangulations and kdtrees of epipolar grids positions
+    at minimum and maximum disparities, as used by terrain_grid_to_epipolar.
+
+    Callers looking up the same grids several times can build them once
+    and give them to each terrain_grid_to_epipolar call.
 
-    for idx in range(edges.shape[0]):
-        edges_ravel = np.ravel(edges[idx, :, :])
-        # simplices filtered if all points are on an edge
-        edges_simplices = np.sum(edges_ravel[tri.simplices], axis=1) == 3
-        simplices[edges_simplices[simplices]] = -1
+    :param epipolar_grid_min: epipolar grid positions at minimum disparity
+    :param epipolar_grid_max: epipolar grid positions at maximum disparity
+    :param epsg: epsg code of the terrain grid
+    :return: triangulation min, triangulation max, kdtree min, kdtree max
+    """
+    precision_factor = get_precision_factor(epsg)
+    if precision_factor != 1.0:
+        epipolar_grid_min = epipolar_grid_min * precision_factor
+        epipolar_grid_max = epipolar_grid_max * precision_factor
+
+    return (
+        Delaunay(epipolar_grid_min),
+        Delaunay(epipolar_grid_max),
+        cKDTree(epipolar_grid_min),
+        cKDTree(epipolar_grid_max),
+    )
 
 
 def terrain_grid_to_epipolar(
@@ -451,9 +569,15 @@ def terrain_grid_to_epipolar(
     epipolar_grid_min,
     epipolar_grid_max,
     epsg,
+    nb_rows_per_block=128,
+    spatial_structures=None,
 ):
     """
     Transform terrain grid to epipolar region
+
+    :param nb_rows_per_block: number of terrain grid rows looked up at once
+    :param spatial_structures: triangulations and kdtrees of the epipolar
+           grids, as returned by build_spatial_structures, built here if None
     """
 
     epipolar_regions_grid_shape = np.shape(epipolar_regions_grid)[:2]
@@ -461,85 +585,95 @@ def terrain_grid_to_epipolar(
         -1, epipolar_regions_grid.shape[-1]
     )
 
-    # in the following code a factor is used to increase the precision
-    spatial_ref = osr.SpatialReference()
-    spatial_ref.ImportFromEPSG(epsg)
-    if spatial_ref.IsGeographic():
-        precision_factor = 1000.0
-    else:
-        precision_factor = 1.0
+    # in the following code a factor is used to increase the precision:
+    # scale terrain grid once, scaling is skipped if precision is not
+    # increased
+    precision_factor = get_precision_factor(epsg)
+    if precision_factor != 1.0:
+        terrain_grid = terrain_grid * precision_factor
+
+    # Get delaunay triangulations and kdtrees
+    if spatial_structures is None:
+        spatial_structures = build_spatial_structures(
+            epipolar_grid_min, epipolar_grid_max, epsg
+        )
+    tri_min, tri_max, tree_min, tree_max = spatial_structures
 
-    # Build delaunay_triangulation
-    tri_min = Delaunay(epipolar_grid_min * precision_factor)
-    tri_max = Delaunay(epipolar_grid_max * precision_factor)
+    # Gather epipolar positions of triangles points once
+    triangles_points_min = epipolar_regions_grid_flat[tri_min.simplices]
+    triangles_points_max = epipolar_regions_grid_flat[tri_max.simplices]
 
-    # Build kdtrees
-    tree_min = cKDTree(epipolar_grid_min * precision_factor)
-    tree_max = cKDTree(epipolar_grid_max * precision_factor)
+    # Get simplices on the edges once for all blocks
+    edges_min = get_simplices_on_the_edges(epipolar_regions_grid_shape, tri_min)
+    edges_max = get_simplices_on_the_edges(epipolar_regions_grid_shape, tri_max)
 
-    # Look-up terrain_grid with Delaunay
-    s_min = tsearch(tri_min, terrain_grid * precision_factor)
-    s_max = tsearch(tri_max, terrain_grid * precision_factor)
+    points_min = np.empty(
+        (*terrain_grid.shape[:-1], epipolar_regions_grid_flat.shape[-1])
+    )
+    points_max = np.empty_like(points_min)
 
-    # Filter simplices on the edges
-    filter_simplices_on_the_edges(epipolar_regions_grid_shape, tri_min, s_min)
-    filter_simplices_on_the_edges(epipolar_regions_grid_shape, tri_max, s_max)
+    # Process terrain grid by blocks of rows to keep the working set of
+    # the look-ups small
+    for first_row in range(0, terrain_grid.shape[0], nb_rows_per_block):
+        rows = slice(first_row, first_row + nb_rows_per_block)
+        terrain_grid_block = terrain_grid[rows]
 
-    points_disp_min = epipolar_regions_grid_flat[tri_min.simplices[s_min]]
+        # Look-up terrain_grid with Delaunay
+        s_min = tsearch(tri_min, terrain_grid_block)
+        s_max = tsearch(tri_max, terrain_grid_block)
 
-    points_disp_max = epipolar_regions_grid_flat[tri_max.simplices[s_max]]
+        # Filter simplices on the edges
+        s_min[edges_min[s_min]] = -1
+        s_max[edges_max[s_max]] = -1
 
-    nn_disp_min = epipolar_regions_grid_flat[
-        tree_min.query(terrain_grid * precision_factor)[1]
-    ]
+        points_disp_min = triangles_points_min[s_min]
 
-    nn_disp_max = epipolar_regions_grid_flat[
-        tree_max.query(terrain_grid * precision_factor)[1]
-    ]
+        points_disp_max = triangles_points_max[s_max]
 
-    points_disp_min_min = np.min(points_disp_min, axis=2)
-    points_disp_min_max = np.max(points_disp_min, axis=2)
-    points_disp_max_min = np.min(points_disp_max, axis=2)
-    points_disp_max_max = np.max(points_disp_max, axis=2)
-
-    # Use either Delaunay search or NN search
-    # if delaunay search fails (point outside triangles)
-    points_disp_min_min = np.where(
-        np.stack((s_min, s_min), axis=-1) != -1,
-        points_disp_min_min,
-        nn_disp_min,
-    )
+        # Nearest neighbors queries are run in parallel on all available cores
+        nn_disp_min = epipolar_regions_grid_flat[
+            tree_min.query(terrain_grid_block, workers=-1)[1]
+        ]
 
-    points_disp_min_max = np.where(
-        np.stack((s_min, s_min), axis=-1) != -1,
-        points_disp_min_max,
-        nn_disp_min,
-    )
+        nn_disp_max = epipolar_regions_grid_flat[
+            tree_max.query(terrain_grid_block, workers=-1)[1]
+        ]
 
-    points_disp_max_min = np.where(
-        np.stack((s_max, s_max), axis=-1) != -1,
-        points_disp_max_min,
-        nn_disp_max,
-    )
+        points_disp_min_min = np.min(points_disp_min, axis=2)
+        points_disp_min_max = np.max(points_disp_min, axis=2)
+        points_disp_max_min = np.min(points_disp_max, axis=2)
+        points_disp_max_max = np.max(points_disp_max, axis=2)
 
-    points_disp_max_max = np.where(
-        np.stack((s_max, s_max), axis=-1) != -1,
-        points_disp_max_max,
-        nn_disp_max,
-    )
+        # Use either Delaunay search or NN search
+        # if delaunay search fails (point outside triangles)
+        inside_min = (s_min != -1)[..., np.newaxis]
+        inside_max = (s_max != -1)[..., np.newaxis]
 
-    points = np.stack(
-        (
-            points_disp_min_min,
-            points_disp_min_max,
-            points_disp_max_min,
-            points_disp_max_max,
-        ),
-        axis=0,
-    )
+        points_disp_min_min = np.where(
+            inside_min, points_disp_min_min, nn_disp_min
+        )
+        points_disp_min_max = np.where(
+            inside_min, points_disp_min_max, nn_disp_min
+        )
+        points_disp_max_min = np.where(
+            inside_max, points_disp_max_min, nn_disp_max
+        )
+        points_disp_max_max = np.where(
+            inside_max, points_disp_max_max, nn_disp_max
+        )
 
-    points_min = np.min(points, axis=0)
-    points_max = np.max(points, axis=0)
+        points = np.stack(
+            (
+                points_disp_min_min,
+                points_disp_min_max,
+                points_disp_max_min,
+                points_disp_max_max,
+            ),
+            axis=0,
+        )
+
+        points_min[rows] = np.min(points, axis=0)
+        points_max[rows] = np.max(points, axis=0)
 
     return points_min, points_max
 
@@ -551,7 +685,33 @@ def region_hash_string(region: Tuple):
 
     :param region: region to hash
     """
-    return "{}_{}_{}_{}".format(region[0], region[1], region[2], region[3])
+    return f"{region[0]}_{region[1]}_{region[2]}_{region[3]}"
+
+
+def stack_epipolar_points(
+    list_epipolar_points_min: list, list_epipolar_points_max: list
+) -> np.ndarray:
+    """
+    Stack epipolar positions of the terrain grid of all pairs, at minimum
+    and maximum disparities, in a single contiguous array with one plane
+    per coordinate, to be used by get_corresponding_tiles_row_col
+
+    :param list_epipolar_points_min: epipolar positions of the terrain grid
+           at minimum disparity, for each pair, of shape (rows, cols, 2)
+    :param list_epipolar_points_max: epipolar positions of the terrain grid
+           at maximum disparity, for each pair, of shape (rows, cols, 2)
+    :return: stacked positions of shape (pairs, 2, 2, rows, cols), with
+             axes pair, coordinate (x, y), disparity (min, max), row, column
+    """
+    epipolar_points = np.stack(
+        (
+            np.stack(list_epipolar_points_min),
+            np.stack(list_epipolar_points_max),
+        ),
+        axis=1,
+    )
+
+    return np.ascontiguousarray(np.moveaxis(epipolar_points, -1, 1))
 
 
 def get_corresponding_tiles_row_col(
@@ -560,8 +720,7 @@ def get_corresponding_tiles_row_col(
     col: int,
     list_points_clouds_left: list,
     list_points_clouds_right: list,
-    list_epipolar_points_min: list,
-    list_epipolar_points_max: list,
+    epipolar_points: np.ndarray,
 ) -> Tuple[List, List, List]:
     """
     This function allows to get required points cloud for each
@@ -573,10 +732,13 @@ def get_corresponding_tiles_row_col(
            epipolar input tiles where keys are image pairs index and values are
            epipolar_points_min, epipolar_points_max, largest_epipolar_region,
            opt_epipolar_tile_size
+    :param epipolar_points: epipolar positions of the terrain grid at
+           minimum and maximum disparities for each pair, as stacked by
+           stack_epipolar_points
 
     :return: Terrain regions, Corresponding tiles selected from
              delayed_point_clouds and Terrain regions "rank" allowing to
-             sorting tiles for dask processing
+             sorting tiles for dask processing, as a (col, row) tuple
     """
 
     j = row
@@ -600,73 +762,27 @@ def get_corresponding_tiles_row_col(
     # This list contains indexes of tiles (debug purpose)
     list_indexes = []
 
+    # Bounding regions of corresponding cell for all stereo configurations
+    # at once, from the epipolar positions of the cell corners at minimum
+    # and maximum disparities
+    corners = epipolar_points[:, :, :, j : j + 2, i : i + 2].reshape(
+        epipolar_points.shape[0], 2, 8
+    )
+    # This mimics the previous code that was using
+    # terrain_region_to_epipolar
+    epipolar_regions = np.concatenate(
+        (corners.min(axis=2), corners.max(axis=2)), axis=1
+    ).tolist()
+
     # For each stereo configuration
-    for (pc_left, pc_right, epipolar_points_min, epipolar_points_max) in zip(
+    for pc_left, pc_right, epipolar_region in zip(
         list_points_clouds_left,
         list_points_clouds_right,
-        list_epipolar_points_min,
-        list_epipolar_points_max,
+        epipolar_regions,
     ):
         largest_epipolar_region = pc_left.attributes["largest_epipolar_region"]
         opt_epipolar_tile_size = pc_left.attributes["opt_epipolar_tile_size"]
 
-        tile_min = np.minimum(
-            np.minimum(
-                np.minimum(
-                    epipolar_points_min[j, i], epipolar_points_min[j + 1, i]
-                ),
-                np.minimum(
-                    epipolar_points_min[j + 1, i + 1],
-                    epipolar_points_min[j, i + 1],
-                ),
-            ),
-            np.minimum(
-                np.minimum(
-                    epipolar_points_max[j, i], epipolar_points_max[j + 1, i]
-                ),
-                np.minimum(
-                    epipolar_points_max[j + 1, i + 1],
-                    epipolar_points_max[j, i + 1],
-                ),
-            ),
-        )
-
-        tile_max = np.maximum(
-            np.maximum(
-                np.maximum(
-                    epipolar_points_min[j, i], epipolar_points_min[j + 1, i]
-                ),
-                np.maximum(
-                    epipolar_points_min[j + 1, i + 1],
-                    epipolar_points_min[j, i + 1],
-                ),
-            ),
-            np.maximum(
-                np.maximum(
-                    epipolar_points_max[j, i], epipolar_points_max[j + 1, i]
-                ),
-                np.maximum(
-                    epipolar_points_max[j + 1, i + 1],
-                    epipolar_points_max[j, i + 1],
-                ),
-            ),
-        )
-
-        # Bounding region of corresponding cell
-        epipolar_region_minx = tile_min[0]
-        epipolar_region_miny = tile_min[1]
-        epipolar_region_maxx = tile_max[0]
-        epipolar_region_maxy = tile_max[1]
-
-        # This mimics the previous code that was using
-        # terrain_region_to_epipolar
-        epipolar_region = [
-            epipolar_region_minx,
-            epipolar_region_miny,
-            epipolar_region_maxx,
-            epipolar_region_maxy,
-        ]
-
         # Crop epipolar region to largest region
         epipolar_region = crop(epipolar_region, largest_epipolar_region)
 
@@ -701,7 +817,8 @@ def get_corresponding_tiles_row_col(
                     required_point_clouds_right.append(pc_right[id_y, id_x])
                     list_indexes.append([id_y, id_x])
 
-    rank = i * i + j * j
+    # Tiles are sorted by column then row
+    rank = (i, j)
 
     return (
         terrain_region,
@@ -727,19 +844,43 @@ def get_paired_regions_as_geodict(
              in epipolar projection
     """
 
-    ter_geodict = {"type": "FeatureCollection", "features": []}
-    epi_geodict = {"type": "FeatureCollection", "features": []}
-
-    for idx, (ter, epi_list) in enumerate(
-        zip(terrain_regions, epipolar_regions)
-    ):
-        feature = {}
-        feature["type"] = "Feature"
-        feature["properties"] = {"id": idx, "nb_epi": len(epi_list)}
-        feature["geometry"] = mapping(box(*ter))
-        ter_geodict["features"].append(feature.copy())
-        feature["geometry"] = mapping(MultiPolygon(box(*x) for x in epi_list))
-
-        epi_geodict["features"].append(feature.copy())
+    # Build all boxes at once, epipolar ones being then split by
+    # terrain region
+    ter_boxes = shapely.box(
+        *np.asarray(terrain_regions, dtype=np.float64).reshape(-1, 4).T
+    )
+    nb_epi = [len(epi_list) for epi_list in epipolar_regions]
+    epi_boxes = shapely.box(
+        *np.asarray(
+            [epi for epi_list in epipolar_regions for epi in epi_list],
+            dtype=np.float64,
+        )
+        .reshape(-1, 4)
+        .T
+    )
+    epi_boxes = np.split(epi_boxes, np.cumsum(nb_epi)[:-1])
+
+    ter_geodict = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"id": idx, "nb_epi": nb},
+                "geometry": mapping(ter),
+            }
+            for idx, (ter, nb) in enumerate(zip(ter_boxes, nb_epi))
+        ],
+    }
+    epi_geodict = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"id": idx, "nb_epi": nb},
+                "geometry": mapping(MultiPolygon(list(epi))),
+            }
+            for idx, (epi, nb) in enumerate(zip(epi_boxes, nb_epi))
+        ],
+    }
 
     return ter_geodict, epi_geodict
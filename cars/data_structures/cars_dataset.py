@@ -61,6 +61,8 @@ PROFILE_FILE = "profile.json"
 ATTRIBUTE_FILE = "attributes.json"
 DATASET_FILE = "dataset"
 DATAFRAME_FILE = "dataframe.csv"
+BUFFERS_FILE = "{}_buffers"
+BUFFERS_ALIGNMENT = 64
 
 PROFILE = "profile"
 WINDOW = "window"
@@ -536,8 +538,7 @@ def load_single_tile_array(tile_path_name: str) -> xr.Dataset:
 
     # get dataset
     dataset_file_name = os.path.join(tile_path_name, DATASET_FILE)
-    with open(dataset_file_name, "rb") as handle:
-        dataset = pickle.load(handle)
+    dataset = load_object_with_buffers(dataset_file_name)
 
     # get attributes
     attributes_file_name = os.path.join(tile_path_name, ATTRIBUTE_FILE)
@@ -567,8 +568,7 @@ def load_single_tile_points(tile_path_name: str):
 
     # get dataframe
     dataframe_file_name = os.path.join(tile_path_name, DATAFRAME_FILE)
-    with open(dataframe_file_name, "rb") as handle:
-        dataframe = pickle.load(handle)
+    dataframe = load_object_with_buffers(dataframe_file_name)
 
     # get attributes
     attributes_file_name = os.path.join(tile_path_name, ATTRIBUTE_FILE)
@@ -615,8 +615,7 @@ def save_single_tile_array(dataset: xr.Dataset, tile_path_name: str):
     # save
     save_dict(custom_attributes, attributes_file_name)
     dataset_file_name = os.path.join(tile_path_name, DATASET_FILE)
-    with open(dataset_file_name, "wb") as handle:
-        pickle.dump(dataset, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    save_object_with_buffers(dataset, dataset_file_name)
 
     # Retrieve attrs
     dataset.attrs = saved_dataset_attrs
@@ -653,8 +652,7 @@ def save_single_tile_points(dataframe, tile_path_name: str):
     # save
     save_dict(custom_attributes, attributes_file_name)
     dataframe_file_name = os.path.join(tile_path_name, DATAFRAME_FILE)
-    with open(dataframe_file_name, "wb") as handle:
-        pickle.dump(dataframe, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    save_object_with_buffers(dataframe, dataframe_file_name)
 
     # Retrieve attrs
     dataframe.attrs = saved_dataframe_attrs
@@ -901,6 +899,69 @@ def load_numpy_array(file_name: str) -> np.ndarray:
         return np.load(descriptor)
 
 
+def save_object_with_buffers(obj, file_name: str):
+    """
+    Pickle object to file, its data buffers (numpy arrays of xarray
+    Dataset or pandas DataFrame) being written out-of-band, directly from
+    memory without copy, all together in a single file next to it
+
+    :param obj: object to save
+    :param file_name: file name to save object in
+    :type file_name: str
+
+    """
+
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    buffers = [buffer.raw() for buffer in buffers]
+
+    with open(file_name, "wb") as handle:
+        # buffers sizes are needed first to split buffers file at loading
+        pickle.dump([buffer.nbytes for buffer in buffers], handle)
+        handle.write(data)
+
+    if buffers:
+        # Write all buffers in a single file, each one being aligned
+        # to be used in place once read
+        with open(BUFFERS_FILE.format(file_name), "wb") as handle:
+            for buffer in buffers:
+                handle.write(buffer)
+                handle.write(bytes(-buffer.nbytes % BUFFERS_ALIGNMENT))
+
+
+def load_object_with_buffers(file_name: str):
+    """
+    Load object saved with save_object_with_buffers.
+    Data buffers are read at once in a single preallocated buffer, used in
+    place by loaded arrays: they stay writable without modifying files, and
+    no file descriptor is kept open while they are alive
+
+    :param file_name: file name object was saved in
+    :type file_name: str
+
+    :return: object
+    """
+
+    with open(file_name, "rb") as handle:
+        sizes = pickle.load(handle)
+
+        all_buffers = bytearray()
+        if sum(sizes) > 0:
+            buffers_file_name = BUFFERS_FILE.format(file_name)
+            all_buffers = bytearray(os.path.getsize(buffers_file_name))
+            with open(buffers_file_name, "rb") as buffers_handle:
+                buffers_handle.readinto(all_buffers)
+        all_buffers = memoryview(all_buffers)
+
+        buffers = []
+        offset = 0
+        for size in sizes:
+            buffers.append(all_buffers[offset : offset + size])
+            offset += size + (-size % BUFFERS_ALIGNMENT)
+
+        return pickle.load(handle, buffers=buffers)
+
+
 def create_none(nb_row: int, nb_col: int):
     """
     Create a grid filled with None. The created grid is a 2D list :
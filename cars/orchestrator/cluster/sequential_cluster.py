@@ -85,16 +85,22 @@ class SequentialCluster(abstract_cluster.AbstractCluster):
 
         """
 
-    def create_task(self, func, nout=1):
+    @staticmethod
+    def create_task(func, nout=1):  # pylint: disable=W0613
         """
         Create task
 
+        Tasks are run in place in sequential mode: the function is returned
+        as is, the number of outputs being only needed by distributed
+        clusters
+
         :param func: function
         :param nout: number of outputs
         """
         return func
 
-    def start_tasks(self, task_list):
+    @staticmethod
+    def start_tasks(task_list):
         """
         Start all tasks
 
@@ -102,7 +108,8 @@ class SequentialCluster(abstract_cluster.AbstractCluster):
         """
         return task_list
 
-    def scatter(self, data, broadcast=True):  # pylint: disable=W0613
+    @staticmethod
+    def scatter(data, broadcast=True):  # pylint: disable=W0613
         """
         Distribute data through workers
 
@@ -110,12 +117,12 @@ class SequentialCluster(abstract_cluster.AbstractCluster):
         """
         return data
 
-    def future_iterator(self, future_list):
+    @staticmethod
+    def future_iterator(future_list):
         """
         Start all tasks
 
         :param future_list: future_list list
         """
 
-        for future in future_list:
-            yield future
+        return iter(future_list)
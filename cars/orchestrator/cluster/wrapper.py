@@ -27,6 +27,7 @@ import logging
 import os
 import shutil
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas
 
@@ -42,6 +43,27 @@ from cars.data_structures import cars_dataset
 DENSE_NAME = "DenseDO"
 SPARSE_NAME = "SparseDO"
 
+# Dumped objects types, with their file name prefix, save and load functions.
+# Temporary objects are only read back by the wrapper: they are saved with
+# their attributes in a single file (and its data buffers file), without
+# the tile directory and json attributes file of CarsDataset tiles
+DUMP_TYPES = {
+    xr.Dataset: (
+        DENSE_NAME,
+        cars_dataset.save_object_with_buffers,
+        cars_dataset.load_object_with_buffers,
+    ),
+    pandas.DataFrame: (
+        SPARSE_NAME,
+        cars_dataset.save_object_with_buffers,
+        cars_dataset.load_object_with_buffers,
+    ),
+}
+# Load functions of dumped objects, by file name prefix
+DUMP_LOADERS = {name: load_fun for name, _, load_fun in DUMP_TYPES.values()}
+# Dumped objects file names start with these prefixes (see create_path)
+DUMP_PREFIXES = tuple(DUMP_LOADERS)
+
 
 class AbstractWrapper(metaclass=ABCMeta):
     """
@@ -113,12 +135,10 @@ class WrapperNone(AbstractWrapper):
         # apply disk wrapper
         new_func = none_wrapper_fun
 
-        # Get overloaded key arguments
-
-        new_kwargs = kwargs
-        new_kwargs["fun"] = func
+        # Get overloaded key arguments, without modifying given ones
+        new_kwargs = {**kwargs, "fun": func}
 
-        return new_func, kwargs
+        return new_func, new_kwargs
 
     def cleanup(self):
         """
@@ -140,8 +160,7 @@ class WrapperDisk(AbstractWrapper):
         """
 
         self.tmp_dir = os.path.join(tmp_dir, "tmp")
-        if not os.path.exists(self.tmp_dir):
-            os.makedirs(self.tmp_dir)
+        os.makedirs(self.tmp_dir, exist_ok=True)
 
         self.current_object_id = 0
 
@@ -174,10 +193,12 @@ class WrapperDisk(AbstractWrapper):
             id_list.append(self.current_object_id)
             self.current_object_id += 1
 
-        new_kwargs = kwargs
-        new_kwargs["id_list"] = id_list
-        new_kwargs["fun"] = func
-        new_kwargs["tmp_dir"] = self.tmp_dir
+        new_kwargs = {
+            **kwargs,
+            "id_list": id_list,
+            "fun": func,
+            "tmp_dir": self.tmp_dir,
+        }
 
         return new_func, new_kwargs
 
@@ -203,8 +224,7 @@ def none_wrapper_fun(*argv, **kwargs):
     :return: path to results
     """
 
-    func = kwargs["fun"]
-    kwargs.pop("fun")
+    func = kwargs.pop("fun")
 
     return func(*argv, **kwargs)
 
@@ -219,17 +239,16 @@ def disk_wrapper_fun(*argv, **kwargs):
     :return: path to results
     """
 
-    # Get function to wrap and id_list
-    id_list = kwargs["id_list"]
-    func = kwargs["fun"]
-    tmp_dir = kwargs["tmp_dir"]
-    kwargs.pop("id_list")
-    kwargs.pop("fun")
-    kwargs.pop("tmp_dir")
+    # Get function to wrap and id_list: kwargs is local to this call,
+    # remaining ones being function kwargs
+    id_list = kwargs.pop("id_list")
+    func = kwargs.pop("fun")
+    tmp_dir = kwargs.pop("tmp_dir")
 
-    # load args
-    loaded_argv = load_args(argv)
-    loaded_kwargs = load_kwargs(kwargs)
+    # load args, objects given several times being loaded once
+    loaded_objects = {}
+    loaded_argv = load_args(argv, loaded_objects)
+    loaded_kwargs = load_kwargs(kwargs, loaded_objects)
 
     # call function
     res = func(*loaded_argv, **loaded_kwargs)
@@ -242,47 +261,92 @@ def disk_wrapper_fun(*argv, **kwargs):
     return to_disk_res
 
 
-def load_args(args):
+def load_args(args, loaded_objects=None):
     """
     Load args from disk to memory
 
     :param argv: args of func
+    :param loaded_objects: already loaded objects, by path, filled with
+        newly loaded ones
 
     :return: new args
     """
 
-    new_args = []
-    for arg in args:
-        if isinstance(arg, list):
-            list_arg = load_args(arg)
-            new_args.append(list_arg)
+    # Nothing to load: args are returned as is, without copy
+    if not contains_dumped_object(args):
+        return args
 
-        else:
-            if is_dumped_object(arg):
-                new_args.append(load(arg))
-            else:
-                new_args.append(arg)
+    if loaded_objects is None:
+        loaded_objects = {}
 
-    return new_args
+    return [
+        load_args(arg, loaded_objects)
+        if isinstance(arg, list)
+        else (load_once(arg, loaded_objects) if is_dumped_object(arg) else arg)
+        for arg in args
+    ]
 
 
-def load_kwargs(kwargs):
+def contains_dumped_object(args):
+    """
+    Check if args, or lists nested in them, contain a dumped object
+
+    :param args: args of func
+
+    :return: contains dumped object
+    :rtype: bool
+    """
+
+    # Walk through nested lists with an explicit stack
+    stack = [args]
+    while stack:
+        for arg in stack.pop():
+            if isinstance(arg, list):
+                stack.append(arg)
+            elif is_dumped_object(arg):
+                return True
+
+    return False
+
+
+def load_kwargs(kwargs, loaded_objects=None):
     """
     Load key args from disk to memory
 
     :param kwargs: keyargs of func
+    :param loaded_objects: already loaded objects, by path, filled with
+        newly loaded ones
 
     :return: new kwargs
     """
 
-    new_kwargs = {}
-    for key in kwargs:
-        if is_dumped_object(kwargs[key]):
-            new_kwargs[key] = load(kwargs[key])
-        else:
-            new_kwargs[key] = kwargs[key]
+    if loaded_objects is None:
+        loaded_objects = {}
+
+    return {
+        key: load_once(value, loaded_objects)
+        if is_dumped_object(value)
+        else value
+        for key, value in kwargs.items()
+    }
 
-    return new_kwargs
+
+def load_once(path, loaded_objects):
+    """
+    Load object from disk, if not already loaded
+
+    :param path: path
+    :type path: str
+    :param loaded_objects: already loaded objects, by path, filled with
+        newly loaded one
+
+    :return: object
+    """
+
+    if path not in loaded_objects:
+        loaded_objects[path] = load(path)
+
+    return loaded_objects[path]
 
 
 def is_dumped_object(obj):
@@ -295,12 +359,9 @@ def is_dumped_object(obj):
     :rtype: bool
     """
 
-    is_dumped = False
-    if isinstance(obj, str):
-        if DENSE_NAME in obj or SPARSE_NAME in obj:
-            is_dumped = True
-
-    return is_dumped
+    return isinstance(obj, str) and os.path.basename(obj).startswith(
+        DUMP_PREFIXES
+    )
 
 
 def load(path):
@@ -315,12 +376,9 @@ def load(path):
 
     if path is not None:
         obj = path
-        if DENSE_NAME in path:
-            obj = cars_dataset.CarsDataset("arrays").load_single_tile(path)
-
-        elif SPARSE_NAME in path:
-            obj = cars_dataset.CarsDataset("points").load_single_tile(path)
-
+        load_fun = DUMP_LOADERS.get(os.path.basename(path).split("_", 1)[0])
+        if load_fun is not None:
+            obj = load_fun(path)
         else:
             logging.warning("Not a dumped arrays or points")
     else:
@@ -336,15 +394,34 @@ def dump_single_object(obj, path):
     :type path: str
     """
 
-    if isinstance(obj, xr.Dataset):
-        # is from array
-        cars_dataset.CarsDataset("arrays").save_single_tile(obj, path)
-    elif isinstance(obj, pandas.DataFrame):
-        # is from points
-        cars_dataset.CarsDataset("points").save_single_tile(obj, path)
-    else:
+    dump_type = get_dump_type(obj)
+    if dump_type is None:
         raise Exception("Not an arrays or points")
 
+    dump_type[1](obj, path)
+
+
+def get_dump_type(obj):
+    """
+    Get file name prefix, save and load functions of object to dump
+
+    :param obj: object to dump
+
+    :return: file name prefix, save and load functions, None if object
+        can not be dumped
+    """
+
+    dump_type = DUMP_TYPES.get(type(obj))
+
+    if dump_type is None:
+        # subclasses of dumped types
+        for obj_type, obj_dump_type in DUMP_TYPES.items():
+            if isinstance(obj, obj_type):
+                dump_type = obj_dump_type
+                break
+
+    return dump_type
+
 
 def create_path(obj, tmp_dir, id_num):
     """
@@ -356,26 +433,23 @@ def create_path(obj, tmp_dir, id_num):
     :return: path
     """
 
-    path = None
-
-    if isinstance(obj, xr.Dataset):
-        # is from array
-        path = DENSE_NAME
-    elif isinstance(obj, pandas.DataFrame):
-        # is from points
-        path = SPARSE_NAME
+    dump_type = get_dump_type(obj)
+    if dump_type is not None:
+        path = dump_type[0]
     else:
         logging.warning("Not an arrays or points")
         path = obj
 
-    path = os.path.join(tmp_dir, path + "_" + repr(id_num))
+    # ids are written in hexadecimal to keep file names short
+    path = os.path.join(tmp_dir, f"{path}_{id_num:x}")
 
     return path
 
 
 def dump(res, tmp_dir, id_list):
     """
-    Dump results to tmp_dir, according to ids
+    Dump results to tmp_dir, according to ids.
+    Results already dumped are not written again, their path is returned
 
     :param res: objects to dump
     :param tmp_dir: tmp_dir
@@ -388,16 +462,37 @@ def dump(res, tmp_dir, id_list):
 
     if len(id_list) > 1:
         paths = []
+        objects = []
+        objects_paths = []
         for i, single_id in enumerate(id_list):
-            if res[i] is not None:
+            if is_dumped_object(res[i]):
+                # already on disk
+                paths.append(res[i])
+            elif res[i] is not None:
                 path = create_path(res[i], tmp_dir, single_id)
-                dump_single_object(res[i], path)
+                objects.append(res[i])
+                objects_paths.append(path)
                 paths.append(path)
             else:
                 paths.append(None)
 
+        if len(objects) > 1:
+            # Objects are written concurrently: writing data releases the GIL
+            with ThreadPoolExecutor(
+                max_workers=min(len(objects), os.cpu_count() or 1)
+            ) as executor:
+                # consume results to raise dump errors
+                list(executor.map(dump_single_object, objects, objects_paths))
+        else:
+            for obj, path in zip(objects, objects_paths):
+                dump_single_object(obj, path)
+
         paths = (*paths,)
 
+    elif is_dumped_object(res):
+        # already on disk
+        paths = res
+
     else:
         paths = create_path(res, tmp_dir, id_list[0])
         dump_single_object(res, paths)
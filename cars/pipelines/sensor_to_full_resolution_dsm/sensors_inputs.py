@@ -25,6 +25,7 @@ Used for full_res and low_res pipelines
 
 import logging
 import os
+from functools import lru_cache
 from typing import List, Tuple
 
 import fiona
@@ -40,6 +41,45 @@ from cars.pipelines.sensor_to_full_resolution_dsm import (
 )
 
 CARS_GEOID_PATH = "geoid/egm96.grd"  # Path in cars package (pkg)
+# Path of cars geoid, from root package directory
+DEFAULT_GEOID_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "conf", CARS_GEOID_PATH)
+)
+
+# Vector formats supported for ROI file
+ROI_VECTOR_EXTENSIONS = frozenset((".gpkg", ".shp", ".kml"))
+
+# Inputs configuration checkers, schemas being constant
+INPUTS_CHECKER = Checker(
+    {
+        sens_cst.SENSORS: dict,
+        sens_cst.PAIRING: [[str]],
+        sens_cst.EPSG: Or(int, None),  # move to rasterization
+        sens_cst.INITIAL_ELEVATION: Or(str, None),
+        sens_cst.DEFAULT_ALT: int,
+        sens_cst.ROI: Or(str, list, tuple, None),
+        sens_cst.CHECK_INPUTS: bool,
+        sens_cst.GEOID: Or(None, str),
+    }
+)
+SENSOR_CHECKER = Checker(
+    {
+        sens_cst.INPUT_IMG: str,
+        sens_cst.INPUT_COLOR: str,
+        sens_cst.INPUT_NODATA: int,
+        sens_cst.INPUT_GEO_MODEL: str,
+        sens_cst.INPUT_MODEL_FILTER: Or([str], None),
+        sens_cst.INPUT_MSK: Or(str, None),
+        sens_cst.INPUT_MSK_CLASSES: dict,
+    }
+)
+MASK_CLASSES_CHECKER = Checker(
+    {
+        sens_cst.IGNORED_BY_DENSE_MATCHING: Or([int], None),
+        sens_cst.SET_TO_REF_ALT: Or([int], None),
+        sens_cst.IGNORED_BY_SPARSE_MATCHING: Or([int], None),
+    }
+)
 
 
 def sensors_check_inputs(conf, config_json_dir=None):  # noqa: C901
@@ -68,126 +108,62 @@ def sensors_check_inputs(conf, config_json_dir=None):  # noqa: C901
     if "geoid" not in overloaded_conf:
         # use cars geoid
         logging.info("CARS will use its own internal file as geoid reference")
-        # Get root package directory
-        package_path = os.path.dirname(__file__)
-        geoid_path = os.path.join(
-            package_path, "..", "..", "conf", CARS_GEOID_PATH
-        )
-        overloaded_conf[sens_cst.GEOID] = geoid_path
+        overloaded_conf[sens_cst.GEOID] = DEFAULT_GEOID_PATH
     else:
         overloaded_conf[sens_cst.GEOID] = conf.get(sens_cst.GEOID, None)
 
     # Validate inputs
-    inputs_schema = {
-        sens_cst.SENSORS: dict,
-        sens_cst.PAIRING: [[str]],
-        sens_cst.EPSG: Or(int, None),  # move to rasterization
-        sens_cst.INITIAL_ELEVATION: Or(str, None),
-        sens_cst.DEFAULT_ALT: int,
-        sens_cst.ROI: Or(str, list, tuple, None),
-        sens_cst.CHECK_INPUTS: bool,
-        sens_cst.GEOID: Or(None, str),
-    }
-
-    checker_inputs = Checker(inputs_schema)
-    checker_inputs.validate(overloaded_conf)
-
-    # Validate each sensor image
-    sensor_schema = {
-        sens_cst.INPUT_IMG: str,
-        sens_cst.INPUT_COLOR: str,
-        sens_cst.INPUT_NODATA: int,
-        sens_cst.INPUT_GEO_MODEL: str,
-        sens_cst.INPUT_MODEL_FILTER: Or([str], None),
-        sens_cst.INPUT_MSK: Or(str, None),
-        sens_cst.INPUT_MSK_CLASSES: dict,
-    }
-    checker_sensor = Checker(sensor_schema)
-
-    mask_classes_schema = {
-        sens_cst.IGNORED_BY_DENSE_MATCHING: Or([int], None),
-        sens_cst.SET_TO_REF_ALT: Or([int], None),
-        sens_cst.IGNORED_BY_SPARSE_MATCHING: Or([int], None),
-    }
-    checker_mask_classes = Checker(mask_classes_schema)
+    INPUTS_CHECKER.validate(overloaded_conf)
 
     for sensor_image_key in conf[sens_cst.SENSORS]:
+        sensor_image = conf[sens_cst.SENSORS][sensor_image_key]
+        overloaded_sensor_image = overloaded_conf[sens_cst.SENSORS][
+            sensor_image_key
+        ]
+
         # Overload optional parameters
-        color = conf[sens_cst.SENSORS][sensor_image_key].get(
-            "color",
-            conf[sens_cst.SENSORS][sensor_image_key][sens_cst.INPUT_IMG],
+        overloaded_sensor_image[sens_cst.INPUT_COLOR] = sensor_image.get(
+            sens_cst.INPUT_COLOR, sensor_image[sens_cst.INPUT_IMG]
         )
-        overloaded_conf[sens_cst.SENSORS][sensor_image_key][
-            sens_cst.INPUT_COLOR
-        ] = color
-
-        geomodel_filters = conf[sens_cst.SENSORS][sensor_image_key].get(
+        overloaded_sensor_image[sens_cst.INPUT_MODEL_FILTER] = sensor_image.get(
             sens_cst.INPUT_MODEL_FILTER, None
         )
-        overloaded_conf[sens_cst.SENSORS][sensor_image_key][
-            sens_cst.INPUT_MODEL_FILTER
-        ] = geomodel_filters
-
-        no_data = conf[sens_cst.SENSORS][sensor_image_key].get(
+        overloaded_sensor_image[sens_cst.INPUT_NODATA] = sensor_image.get(
             sens_cst.INPUT_NODATA, -9999
         )
-        overloaded_conf[sens_cst.SENSORS][sensor_image_key][
-            sens_cst.INPUT_NODATA
-        ] = no_data
+        mask = sensor_image.get(sens_cst.INPUT_MSK, None)
+        overloaded_sensor_image[sens_cst.INPUT_MSK] = mask
 
-        mask = conf[sens_cst.SENSORS][sensor_image_key].get(
-            sens_cst.INPUT_MSK, None
-        )
-        overloaded_conf[sens_cst.SENSORS][sensor_image_key][
-            sens_cst.INPUT_MSK
-        ] = mask
+        mask_classes_dict = sensor_image.get(sens_cst.INPUT_MSK_CLASSES, {})
 
-        if (
-            sens_cst.INPUT_MSK_CLASSES
-            in conf[sens_cst.SENSORS][sensor_image_key]
+        # Mask classes are only scanned when no mask is given
+        if mask is None and any(
+            value is not None for value in mask_classes_dict.values()
         ):
-            filled_with_none = True
-            for _, value in conf[sens_cst.SENSORS][sensor_image_key][
-                sens_cst.INPUT_MSK_CLASSES
-            ].items():
-                if value is not None:
-                    filled_with_none = False
-                    break
-
-            if not filled_with_none and mask is None:
-                logging.error("Mask classes were given with no mask associated")
-                raise Exception(
-                    "Mask classes were given with no mask associated"
-                )
-
-        mask_classes_dict = conf[sens_cst.SENSORS][sensor_image_key].get(
-            "mask_classes", {}
-        )
-        updated_mask_classes = mask_classes_dict.copy()
-        updated_mask_classes[
-            sens_cst.IGNORED_BY_DENSE_MATCHING
-        ] = mask_classes_dict.get(sens_cst.IGNORED_BY_DENSE_MATCHING, None)
-        updated_mask_classes[sens_cst.SET_TO_REF_ALT] = mask_classes_dict.get(
-            sens_cst.SET_TO_REF_ALT, None
-        )
-        updated_mask_classes[
-            sens_cst.IGNORED_BY_SPARSE_MATCHING
-        ] = mask_classes_dict.get(sens_cst.IGNORED_BY_SPARSE_MATCHING, None)
+            logging.error("Mask classes were given with no mask associated")
+            raise Exception("Mask classes were given with no mask associated")
+
+        updated_mask_classes = {
+            **mask_classes_dict,
+            sens_cst.IGNORED_BY_DENSE_MATCHING: mask_classes_dict.get(
+                sens_cst.IGNORED_BY_DENSE_MATCHING, None
+            ),
+            sens_cst.SET_TO_REF_ALT: mask_classes_dict.get(
+                sens_cst.SET_TO_REF_ALT, None
+            ),
+            sens_cst.IGNORED_BY_SPARSE_MATCHING: mask_classes_dict.get(
+                sens_cst.IGNORED_BY_SPARSE_MATCHING, None
+            ),
+        }
         # Check if protected keys are used
         mask_classes.check_mask_classes(updated_mask_classes)
-        overloaded_conf[sens_cst.SENSORS][sensor_image_key][
+        overloaded_sensor_image[
             sens_cst.INPUT_MSK_CLASSES
         ] = updated_mask_classes
 
         # Validate
-        checker_sensor.validate(
-            overloaded_conf[sens_cst.SENSORS][sensor_image_key]
-        )
-        checker_mask_classes.validate(
-            overloaded_conf[sens_cst.SENSORS][sensor_image_key][
-                sens_cst.INPUT_MSK_CLASSES
-            ]
-        )
+        SENSOR_CHECKER.validate(overloaded_sensor_image)
+        MASK_CLASSES_CHECKER.validate(updated_mask_classes)
 
     # Validate pairs
     for (key1, key2) in overloaded_conf[sens_cst.PAIRING]:
@@ -295,8 +271,10 @@ def check_srtm(srtm_dir):
 
     if srtm_dir is not None:
         if os.path.isdir(srtm_dir):
-            srtm_tiles = os.listdir(srtm_dir)
-            if len(srtm_tiles) == 0:
+            # Only the first entry is needed to know if directory is empty
+            with os.scandir(srtm_dir) as srtm_tiles:
+                is_empty = next(srtm_tiles, None) is None
+            if is_empty:
                 logging.warning(
                     "SRTM directory is empty, "
                     "the default altitude will be used as reference altitude."
@@ -334,21 +312,23 @@ def parse_roi_file(arg_roi_file: str) -> Tuple[List[float], int]:
     if not os.path.exists(arg_roi_file):
         logging.error("File {} does not exist".format(arg_roi_file))
     else:
-        # if it is a vector file
-        if extension in [".gpkg", ".shp", ".kml"]:
+        # if it is a vector file, no need to try to open it as an image
+        if extension.lower() in ROI_VECTOR_EXTENSIONS:
             roi_poly, roi_epsg = inputs.read_vector(arg_roi_file)
             roi = (roi_poly.bounds, roi_epsg)
 
         # if not, it is an image
         elif inputs.rasterio_can_open(arg_roi_file):
-            data = rio.open(arg_roi_file)
-            xmin = min(data.bounds.left, data.bounds.right)
-            ymin = min(data.bounds.bottom, data.bounds.top)
-            xmax = max(data.bounds.left, data.bounds.right)
-            ymax = max(data.bounds.bottom, data.bounds.top)
+            with rio.open(arg_roi_file) as data:
+                bounds = data.bounds
+                crs = data.crs
+            xmin = min(bounds.left, bounds.right)
+            ymin = min(bounds.bottom, bounds.top)
+            xmax = max(bounds.left, bounds.right)
+            ymax = max(bounds.bottom, bounds.top)
 
             try:
-                roi_epsg = data.crs.to_epsg()
+                roi_epsg = crs.to_epsg()
                 roi = ([xmin, ymin, xmax, ymax], roi_epsg)
             except AttributeError as error:
                 logging.error("ROI EPSG code {} not readable".format(error))
@@ -381,31 +361,72 @@ def check_input_data(image, mask, color):
     :type color: str
     """
 
-    if inputs.rasterio_get_nb_bands(image) != 1:
+    nb_bands, image_size, trans = get_raster_metadata(image)
+
+    if nb_bands != 1:
         raise Exception("{} is not mono-band images".format(image))
 
     if mask is not None:
-        if inputs.rasterio_get_size(image) != inputs.rasterio_get_size(mask):
+        if image_size != get_raster_metadata(mask)[1]:
             raise Exception(
                 "The image {} and the mask {} "
                 "do not have the same size".format(image, mask)
             )
 
-    with rio.open(image) as img_reader:
-        trans = img_reader.transform
-        if trans.e < 0:
-            logging.warning(
-                "{} seems to have an incoherent pixel size. "
-                "Input images has to be in sensor geometry.".format(image)
-            )
+    if trans.e < 0:
+        logging.warning(
+            "{} seems to have an incoherent pixel size. "
+            "Input images has to be in sensor geometry.".format(image)
+        )
 
-    with rio.open(color) as img_reader:
-        trans = img_reader.transform
-        if trans.e < 0:
-            logging.warning(
-                "{} seems to have an incoherent pixel size. "
-                "Input images has to be in sensor geometry.".format(image)
-            )
+    trans = get_raster_metadata(color)[2]
+    if trans.e < 0:
+        logging.warning(
+            "{} seems to have an incoherent pixel size. "
+            "Input images has to be in sensor geometry.".format(image)
+        )
+
+
+def get_raster_metadata(raster_file: str):
+    """
+    Get number of bands, size and transform of a raster.
+    Metadata are cached, rasters being shared between sensors and
+    configurations: each raster is opened once while it is not modified
+
+    :param raster_file: raster path
+    :type raster_file: str
+
+    :return: number of bands, size (width, height), transform
+    """
+
+    try:
+        stat = os.stat(raster_file)
+    except OSError:
+        # not a local file (GDAL virtual file system)
+        return read_raster_metadata(raster_file, None, None)
+
+    return read_raster_metadata(raster_file, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def read_raster_metadata(  # pylint: disable=W0613
+    raster_file: str, mtime: int, size: int
+):
+    """
+    Read number of bands, size and transform of a raster
+
+    :param raster_file: raster path
+    :type raster_file: str
+    :param mtime: modification time of raster file, for cache validity
+    :type mtime: int
+    :param size: size of raster file, for cache validity
+    :type size: int
+
+    :return: number of bands, size (width, height), transform
+    """
+
+    with rio.open(raster_file) as reader:
+        return reader.count, (reader.width, reader.height), reader.transform
 
 
 def generate_inputs(conf):
@@ -25,19 +25,22 @@ CARS sensor_to_full_resolution_dsm pipeline class file
 # Standard imports
 from __future__ import print_function
 
+import copy
 import json
 import logging
 import os
+from functools import lru_cache
 
 # CARS imports
 from cars import __version__
 from cars.applications.application import Application
 from cars.applications.grid_generation import grid_correction
-from cars.applications.sparse_matching import sparse_matching_tools
+from cars.applications.sparse_matching import sparse_matching_tools as sm_tools
 from cars.conf import log_conf
 from cars.core import preprocessing
 from cars.core.utils import safe_makedirs
 from cars.orchestrator import orchestrator
+from cars.orchestrator.cluster import sequential_cluster
 from cars.pipelines.pipeline import Pipeline
 from cars.pipelines.pipeline_template import PipelineTemplate
 from cars.pipelines.sensor_to_full_resolution_dsm import dsm_output
@@ -49,6 +52,34 @@ from cars.pipelines.sensor_to_full_resolution_dsm import sensors_inputs
 # Path in cars package (pkg)
 CARS_GEOID_PATH = "geoid/egm96.grd"
 
+# Maximum number of pairs whose sparse matching is computed at once on
+# parallel clusters: resampled images and matches of all pairs of a batch
+# are kept until its breakpoint, so a few pairs are enough to keep workers
+# busy between pairs while bounding memory
+NB_PAIRS_PER_BREAKPOINT = 8
+
+
+@lru_cache(maxsize=1)
+def load_pipeline_config():
+    """
+    Load the default configuration of the pipeline, parsed only once
+
+    :return: default pipeline configuration
+    :rtype: dict
+    """
+    # Get root package directory
+    package_path = os.path.dirname(__file__)
+    json_file = os.path.join(
+        package_path,
+        "..",
+        "conf_pipeline",
+        "sensor_to_low_resolution_dsm.json",
+    )
+    with open(json_file, "r", encoding="utf8") as fstream:
+        pipeline_config = json.load(fstream)
+
+    return pipeline_config
+
 
 @Pipeline.register("sensor_to_low_resolution_dsm")
 class SensorToLowResolutionDsmPipeline(PipelineTemplate):
@@ -58,6 +89,17 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
 
     # pylint: disable=too-many-instance-attributes
 
+    # Applications used in pipeline, in the order they are instantiated
+    APPLICATIONS = (
+        "grid_generation",
+        "sparse_matching",
+        "resampling",
+        "dense_matching",
+        "triangulation",
+        "point_cloud_fusion",
+        "point_cloud_rasterization",
+    )
+
     def __init__(self, conf, config_json_dir=None):
         """
         Creates pipeline
@@ -72,19 +114,8 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
 
         # Merge parameters from associated json
         # priority : cars_pipeline.json << user_inputs.json
-        # Get root package directory
-        package_path = os.path.dirname(__file__)
-        json_file = os.path.join(
-            package_path,
-            "..",
-            "conf_pipeline",
-            "sensor_to_low_resolution_dsm.json",
-        )
-        with open(json_file, "r", encoding="utf8") as fstream:
-            pipeline_config = json.load(fstream)
-
-        self.conf = pipeline_config.copy()
-        self.conf.update(conf)
+        # Default configuration is copied, not to alter the cached one
+        self.conf = {**copy.deepcopy(load_pipeline_config()), **conf}
 
         # Check conf orchestrator
         self.orchestrator_conf = self.conf.get(sens_cst.ORCHESTRATOR, None)
@@ -138,60 +169,32 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
         :type conf: dict
         """
 
-        # Check if all specified applications are used
-        needed_applications = [
-            "grid_generation",
-            "sparse_matching",
-            "resampling",
-            "dense_matching",
-            "triangulation",
-            "point_cloud_fusion",
-            "point_cloud_rasterization",
-        ]
-
-        for app_key in conf.keys():
-            if app_key not in needed_applications:
-                logging.error(
-                    "No {} application used in pipeline".format(app_key)
+        # Report all unknown applications at once
+        unknown_applications = sorted(set(conf) - set(self.APPLICATIONS))
+        if unknown_applications:
+            logging.error(
+                "Applications {} are not used in pipeline".format(
+                    unknown_applications
                 )
-                raise Exception(
-                    "No {} application used in pipeline".format(app_key)
+            )
+            raise Exception(
+                "Applications {} are not used in pipeline".format(
+                    unknown_applications
                 )
+            )
 
-        # Epipolar grid generation
-        self.epipolar_grid_generation_application = Application(
-            "grid_generation", cfg=conf.get("grid_generation", {})
-        )
-
-        # Sparse Matching
-        self.sparse_matching_app = Application(
-            "sparse_matching", cfg=conf.get("sparse_matching", {})
-        )
-
-        # image resampling
-        self.resampling_application = Application(
-            "resampling", cfg=conf.get("resampling", {})
-        )
-
-        # Matching
-        self.dense_matching_application = Application(
-            "dense_matching", cfg=conf.get("dense_matching", {})
-        )
-
-        # Triangulation
-        self.triangulation_application = Application(
-            "triangulation", cfg=conf.get("triangulation", {})
-        )
-
-        # Points cloud fusion
-        self.pc_fusion_application = Application(
-            "point_cloud_fusion", cfg=conf.get("point_cloud_fusion", {})
-        )
-
-        # Rasterization
-        self.rasterization_application = Application(
-            "point_cloud_rasterization",
-            cfg=conf.get("point_cloud_rasterization", {}),
+        # Instantiate applications, in APPLICATIONS order
+        (
+            self.epipolar_grid_generation_application,
+            self.sparse_matching_app,
+            self.resampling_application,
+            self.dense_matching_application,
+            self.triangulation_application,
+            self.pc_fusion_application,
+            self.rasterization_application,
+        ) = (
+            Application(app_key, cfg=conf.get(app_key, {}))
+            for app_key in self.APPLICATIONS
         )
 
     def run(self):
@@ -225,11 +228,13 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
 
             # Initialize epsg for terrain tiles
             epsg = self.inputs[sens_cst.EPSG]
-            if epsg is not None:
+
+            # Roi polygon is computed once, as soon as epsg is known
+            input_roi = self.inputs[sens_cst.ROI]
+            roi_poly = None
+            if epsg is not None and input_roi is not None:
                 # Compute roi polygon, in input EPSG
-                roi_poly = preprocessing.compute_roi_poly(
-                    self.inputs[sens_cst.ROI], epsg
-                )
+                roi_poly = preprocessing.compute_roi_poly(input_roi, epsg)
 
             list_terrain_roi = []
 
@@ -244,189 +249,255 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
                 )
             )
 
-            for (
-                pair_key,
-                sensor_image_left,
-                sensor_image_right,
-            ) in list_sensor_pairs:
-
-                # Create Pair folder
-                pair_folder = os.path.join(out_dir, pair_key)
-                safe_makedirs(pair_folder)
-                safe_makedirs(os.path.join(pair_folder, "tmp"))
-
-                # Run applications
+            # Inputs and applications parameters used for each pair
+            srtm_dir = self.inputs[sens_cst.INITIAL_ELEVATION]
+            default_alt = self.inputs[sens_cst.DEFAULT_ALT]
+            geoid_path = self.inputs[sens_cst.GEOID]
+            check_inputs = self.inputs[sens_cst.CHECK_INPUTS]
+            save_matches = self.sparse_matching_app.get_save_matches()
+            disparity_margin = self.sparse_matching_app.get_disparity_margin()
+            geometry_loader = (
+                self.triangulation_application.get_geometry_loader()
+            )
+            resolution = self.rasterization_application.get_resolution()
+            disp_out_reject_percent = (
+                self.sparse_matching_app.get_disp_out_reject_percent()
+            )
 
-                # Run grid generation
-                (
-                    grid_left,
-                    grid_right,
-                ) = self.epipolar_grid_generation_application.run(
+            # Pairs are processed by batches, to bound the number of pairs
+            # whose images and matches are in flight on the cluster.
+            # Sequential tasks are run in place so nothing overlaps: pairs
+            # are processed one by one to keep memory as low as possible
+            nb_pairs_per_breakpoint = NB_PAIRS_PER_BREAKPOINT
+            if isinstance(
+                cars_orchestrator.cluster, sequential_cluster.SequentialCluster
+            ):
+                nb_pairs_per_breakpoint = 1
+
+            for first_pair_idx in range(
+                0, len(list_sensor_pairs), nb_pairs_per_breakpoint
+            ):
+                # First pass: submit sparse matching of pairs of batch, to
+                # compute them all at once and overlap pairs on the cluster
+                list_pairs_matches = []
+                for (
+                    pair_key,
                     sensor_image_left,
                     sensor_image_right,
-                    orchestrator=cars_orchestrator,
-                    pair_folder=pair_folder,
-                    pair_key=pair_key,
-                    srtm_dir=self.inputs[sens_cst.INITIAL_ELEVATION],
-                    default_alt=self.inputs[sens_cst.DEFAULT_ALT],
-                    geoid_path=self.inputs[sens_cst.GEOID],
-                )
+                ) in list_sensor_pairs[
+                    first_pair_idx : first_pair_idx + nb_pairs_per_breakpoint
+                ]:
 
-                # Run epipolar resampling
-                (
-                    epipolar_image_left,
-                    epipolar_image_right,
-                ) = self.resampling_application.run(
+                    # Create Pair folder, along with its tmp folder
+                    pair_folder = os.path.join(out_dir, pair_key)
+                    safe_makedirs(os.path.join(pair_folder, "tmp"))
+
+                    # Run applications
+
+                    # Run grid generation
+                    (
+                        grid_left,
+                        grid_right,
+                    ) = self.epipolar_grid_generation_application.run(
+                        sensor_image_left,
+                        sensor_image_right,
+                        orchestrator=cars_orchestrator,
+                        pair_folder=pair_folder,
+                        pair_key=pair_key,
+                        srtm_dir=srtm_dir,
+                        default_alt=default_alt,
+                        geoid_path=geoid_path,
+                    )
+                    disp_to_alt_ratio = grid_left.attributes[
+                        "disp_to_alt_ratio"
+                    ]
+
+                    # Run epipolar resampling
+                    (
+                        epipolar_image_left,
+                        epipolar_image_right,
+                    ) = self.resampling_application.run(
+                        sensor_image_left,
+                        sensor_image_right,
+                        grid_left,
+                        grid_right,
+                        orchestrator=cars_orchestrator,
+                        pair_folder=pair_folder,
+                        pair_key=pair_key,
+                        margins=self.sparse_matching_app.get_margins(),
+                        add_color=False,
+                    )
+
+                    # Run epipolar sparse_matching application
+                    (epipolar_matches_left, _,) = self.sparse_matching_app.run(
+                        epipolar_image_left,
+                        epipolar_image_right,
+                        disp_to_alt_ratio,
+                        orchestrator=cars_orchestrator,
+                        pair_folder=pair_folder,
+                        pair_key=pair_key,
+                        mask1_ignored_by_sift=sensor_image_left[
+                            sens_cst.INPUT_MSK_CLASSES
+                        ][sens_cst.IGNORED_BY_SPARSE_MATCHING],
+                        mask2_ignored_by_sift=sensor_image_right[
+                            sens_cst.INPUT_MSK_CLASSES
+                        ][sens_cst.IGNORED_BY_SPARSE_MATCHING],
+                    )
+
+                    # Matches of batch are computed at next breakpoint
+                    cars_orchestrator.add_to_replace_lists(
+                        epipolar_matches_left, cars_ds_name="epi_matches_left"
+                    )
+
+                    list_pairs_matches.append(
+                        (
+                            pair_key,
+                            pair_folder,
+                            sensor_image_left,
+                            sensor_image_right,
+                            grid_left,
+                            grid_right,
+                            disp_to_alt_ratio,
+                            epipolar_image_left,
+                            epipolar_image_right,
+                            epipolar_matches_left,
+                        )
+                    )
+
+                # Compute sparse matching of all pairs of batch
+                cars_orchestrator.breakpoint()
+
+                # Second pass: correct grids and triangulate each pair
+                for (
+                    pair_key,
+                    pair_folder,
                     sensor_image_left,
                     sensor_image_right,
                     grid_left,
                     grid_right,
-                    orchestrator=cars_orchestrator,
-                    pair_folder=pair_folder,
-                    pair_key=pair_key,
-                    margins=self.sparse_matching_app.get_margins(),
-                    add_color=False,
-                )
-
-                # Run epipolar sparse_matching application
-                (epipolar_matches_left, _,) = self.sparse_matching_app.run(
+                    disp_to_alt_ratio,
                     epipolar_image_left,
                     epipolar_image_right,
-                    grid_left.attributes["disp_to_alt_ratio"],
-                    orchestrator=cars_orchestrator,
-                    pair_folder=pair_folder,
-                    pair_key=pair_key,
-                    mask1_ignored_by_sift=sensor_image_left[
-                        sens_cst.INPUT_MSK_CLASSES
-                    ][sens_cst.IGNORED_BY_SPARSE_MATCHING],
-                    mask2_ignored_by_sift=sensor_image_right[
-                        sens_cst.INPUT_MSK_CLASSES
-                    ][sens_cst.IGNORED_BY_SPARSE_MATCHING],
-                )
+                    epipolar_matches_left,
+                ) in list_pairs_matches:
 
-                # Run grid correction application
+                    # Run grid correction application
 
-                # Filter matches
-                matches_array = self.sparse_matching_app.filter_matches(
-                    epipolar_matches_left,
-                    orchestrator=cars_orchestrator,
-                    pair_key=pair_key,
-                    pair_folder=pair_folder,
-                    save_matches=self.sparse_matching_app.get_save_matches(),
-                )
-                # Estimate grid correction
-                (
-                    grid_correction_coef,
-                    corrected_matches_array,
-                    corrected_matches_cars_ds_left,
-                    corrected_matches_cars_ds_right,
-                    _,
-                    _,
-                ) = grid_correction.estimate_right_grid_correction(
-                    matches_array,
-                    grid_right,
-                    initial_cars_ds=epipolar_matches_left,
-                )
+                    # Filter matches
+                    matches_array = self.sparse_matching_app.filter_matches(
+                        epipolar_matches_left,
+                        orchestrator=cars_orchestrator,
+                        pair_key=pair_key,
+                        pair_folder=pair_folder,
+                        save_matches=save_matches,
+                    )
+                    # Estimate grid correction
+                    (
+                        grid_correction_coef,
+                        corrected_matches_array,
+                        corrected_matches_cars_ds_left,
+                        corrected_matches_cars_ds_right,
+                        _,
+                        _,
+                    ) = grid_correction.estimate_right_grid_correction(
+                        matches_array,
+                        grid_right,
+                        initial_cars_ds=epipolar_matches_left,
+                    )
 
-                # Correct grid right
-                corrected_grid_right = grid_correction.correct_grid(
-                    grid_right, grid_correction_coef
-                )
+                    # Correct grid right
+                    corrected_grid_right = grid_correction.correct_grid(
+                        grid_right, grid_correction_coef
+                    )
 
-                # Compute disp_min and disp_max
-                (
-                    dmin,
-                    dmax,
-                ) = sparse_matching_tools.derive_disparity_range_from_matches(
-                    corrected_matches_array,
-                    orchestrator=cars_orchestrator,
-                    disparity_margin=(
-                        self.sparse_matching_app.get_disparity_margin()
-                    ),
-                    pair_key=pair_key,
-                    pair_folder=pair_folder,
-                    disp_to_alt_ratio=(
-                        grid_left.attributes["disp_to_alt_ratio"]
-                    ),
-                    disparity_outliers_rejection_percent=(
-                        self.sparse_matching_app.get_disp_out_reject_percent()
-                    ),
-                    save_matches=self.sparse_matching_app.get_save_matches(),
-                )
+                    # Compute disp_min and disp_max
+                    (dmin, dmax) = sm_tools.derive_disparity_range_from_matches(
+                        corrected_matches_array,
+                        orchestrator=cars_orchestrator,
+                        disparity_margin=disparity_margin,
+                        pair_key=pair_key,
+                        pair_folder=pair_folder,
+                        disp_to_alt_ratio=disp_to_alt_ratio,
+                        disparity_outliers_rejection_percent=(
+                            disp_out_reject_percent
+                        ),
+                        save_matches=save_matches,
+                    )
 
-                if epsg is None:
-                    # compute epsg
-                    epsg = preprocessing.compute_epsg(
+                    if epsg is None:
+                        # compute epsg
+                        epsg = preprocessing.compute_epsg(
+                            sensor_image_left,
+                            sensor_image_right,
+                            grid_left,
+                            grid_right,
+                            geometry_loader,
+                            orchestrator=cars_orchestrator,
+                            pair_folder=pair_folder,
+                            srtm_dir=srtm_dir,
+                            default_alt=default_alt,
+                            disp_min=dmin,
+                            disp_max=dmax,
+                        )
+                        if input_roi is not None:
+                            # Compute roi polygon, in input EPSG
+                            roi_poly = preprocessing.compute_roi_poly(
+                                input_roi, epsg
+                            )
+
+                    # Run epipolar triangulation application
+                    (
+                        epipolar_points_cloud_left,
+                        epipolar_points_cloud_right,
+                    ) = self.triangulation_application.run(
                         sensor_image_left,
                         sensor_image_right,
+                        epipolar_image_left,
+                        epipolar_image_right,
                         grid_left,
                         grid_right,
-                        self.triangulation_application.get_geometry_loader(),
+                        corrected_matches_cars_ds_left,
+                        corrected_matches_cars_ds_right,
+                        epsg,
                         orchestrator=cars_orchestrator,
                         pair_folder=pair_folder,
-                        srtm_dir=self.inputs[sens_cst.INITIAL_ELEVATION],
-                        default_alt=self.inputs[sens_cst.DEFAULT_ALT],
+                        pair_key=pair_key,
+                        uncorrected_grid_right=grid_right,
+                        geoid_path=geoid_path,
                         disp_min=dmin,
                         disp_max=dmax,
                     )
-                    # Compute roi polygon, in input EPSG
-                    roi_poly = preprocessing.compute_roi_poly(
-                        self.inputs[sens_cst.ROI], epsg
-                    )
 
-                # Run epipolar triangulation application
-                (
-                    epipolar_points_cloud_left,
-                    epipolar_points_cloud_right,
-                ) = self.triangulation_application.run(
-                    sensor_image_left,
-                    sensor_image_right,
-                    epipolar_image_left,
-                    epipolar_image_right,
-                    grid_left,
-                    grid_right,
-                    corrected_matches_cars_ds_left,
-                    corrected_matches_cars_ds_right,
-                    epsg,
-                    orchestrator=cars_orchestrator,
-                    pair_folder=pair_folder,
-                    pair_key=pair_key,
-                    uncorrected_grid_right=grid_right,
-                    geoid_path=self.inputs[sens_cst.GEOID],
-                    disp_min=dmin,
-                    disp_max=dmax,
-                )
-
-                # Compute terrain bounding box /roi related to current images
-                current_terrain_roi_bbox = preprocessing.compute_terrain_bbox(
-                    self.inputs[sens_cst.INITIAL_ELEVATION],
-                    self.inputs[sens_cst.DEFAULT_ALT],
-                    self.inputs[sens_cst.GEOID],
-                    sensor_image_left,
-                    sensor_image_right,
-                    epipolar_image_left,
-                    grid_left,
-                    corrected_grid_right,
-                    epsg,
-                    self.triangulation_application.get_geometry_loader(),
-                    resolution=self.rasterization_application.get_resolution(),
-                    disp_min=dmin,
-                    disp_max=dmax,
-                    roi_poly=roi_poly,
-                    orchestrator=cars_orchestrator,
-                    pair_key=pair_key,
-                    pair_folder=pair_folder,
-                    check_inputs=self.inputs[sens_cst.CHECK_INPUTS],
-                )
-                list_terrain_roi.append(current_terrain_roi_bbox)
+                    # Compute terrain bounding box /roi of current images
+                    terrain_roi_bbox = preprocessing.compute_terrain_bbox(
+                        srtm_dir,
+                        default_alt,
+                        geoid_path,
+                        sensor_image_left,
+                        sensor_image_right,
+                        epipolar_image_left,
+                        grid_left,
+                        corrected_grid_right,
+                        epsg,
+                        geometry_loader,
+                        resolution=resolution,
+                        disp_min=dmin,
+                        disp_max=dmax,
+                        roi_poly=roi_poly,
+                        orchestrator=cars_orchestrator,
+                        pair_key=pair_key,
+                        pair_folder=pair_folder,
+                        check_inputs=check_inputs,
+                    )
+                    list_terrain_roi.append(terrain_roi_bbox)
 
-                # add points cloud to list
-                list_epipolar_points_cloud_left.append(
-                    epipolar_points_cloud_left
-                )
-                list_epipolar_points_cloud_right.append(
-                    epipolar_points_cloud_right
-                )
+                    # add points cloud to list
+                    list_epipolar_points_cloud_left.append(
+                        epipolar_points_cloud_left
+                    )
+                    list_epipolar_points_cloud_right.append(
+                        epipolar_points_cloud_right
+                    )
 
             # compute terrain bounds
             (
@@ -435,7 +506,7 @@ class SensorToLowResolutionDsmPipeline(PipelineTemplate):
             ) = preprocessing.compute_terrain_bounds(
                 list_terrain_roi,
                 roi_poly=roi_poly,
-                resolution=self.rasterization_application.get_resolution(),
+                resolution=resolution,
             )
 
             # Merge point clouds
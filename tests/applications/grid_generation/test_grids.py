@@ -56,14 +56,13 @@ def test_correct_right_grid():
     origin = [0, 0]
     spacing = [30, 30]
 
-    matches = np.load(matches_file)
-    matches = np.array(matches)
+    matches = np.load(matches_file, mmap_mode="r")
 
     matches_filtered = sparse_matching_tools.remove_epipolar_outliers(matches)
 
     with rio.open(grid_file) as rio_grid:
         grid = rio_grid.read()
-        grid = np.transpose(grid, (1, 2, 0))
+        grid = np.ascontiguousarray(np.moveaxis(grid, 0, -1))
 
         # Estimate grid correction
         # Create fake cars dataset with grid
@@ -96,7 +95,8 @@ def test_correct_right_grid():
         # np.save(absolute_data_path("ref_output/corrected_right_grid.npy"),
         # corrected_grid)
         corrected_grid_ref = np.load(
-            absolute_data_path("ref_output/corrected_right_grid.npy")
+            absolute_data_path("ref_output/corrected_right_grid.npy"),
+            mmap_mode="r",
         )
         np.testing.assert_allclose(
             corrected_grid, corrected_grid_ref, atol=0.05, rtol=1.0e-6
@@ -185,21 +185,23 @@ def test_generate_epipolar_grids_default_alt():
     # left_grid.to_netcdf(absolute_data_path(
     # "ref_output/left_grid_default_alt.nc"))
 
-    left_grid_ref = xr.open_dataset(
-        absolute_data_path("ref_output/left_grid_default_alt.nc")
-    )
-    assert np.allclose(left_grid_ref["x"].values, left_grid[:, :, 0])
-    assert np.allclose(left_grid_ref["y"].values, left_grid[:, :, 1])
+    with xr.open_dataset(
+        absolute_data_path("ref_output/left_grid_default_alt.nc"),
+        decode_cf=False,
+    ) as left_grid_ref:
+        assert np.allclose(left_grid_ref["x"].values, left_grid[:, :, 0])
+        assert np.allclose(left_grid_ref["y"].values, left_grid[:, :, 1])
 
     # Uncomment to update baseline
     # right_grid.to_netcdf(absolute_data_path(
     # "ref_output/right_grid_default_alt.nc"))
 
-    right_grid_ref = xr.open_dataset(
-        absolute_data_path("ref_output/right_grid_default_alt.nc")
-    )
-    assert np.allclose(right_grid_ref["x"].values, right_grid[:, :, 0])
-    assert np.allclose(right_grid_ref["y"].values, right_grid[:, :, 1])
+    with xr.open_dataset(
+        absolute_data_path("ref_output/right_grid_default_alt.nc"),
+        decode_cf=False,
+    ) as right_grid_ref:
+        assert np.allclose(right_grid_ref["x"].values, right_grid[:, :, 0])
+        assert np.allclose(right_grid_ref["y"].values, right_grid[:, :, 1])
 
 
 @pytest.mark.unit_tests
@@ -239,17 +241,17 @@ def test_generate_epipolar_grids():
     # Uncomment to update baseline
     # left_grid.to_netcdf(absolute_data_path("ref_output/left_grid.nc"))
 
-    left_grid_ref = xr.open_dataset(
-        absolute_data_path("ref_output/left_grid.nc")
-    )
-    assert np.allclose(left_grid_ref["x"].values, left_grid[:, :, 0])
-    assert np.allclose(left_grid_ref["y"].values, left_grid[:, :, 1])
+    with xr.open_dataset(
+        absolute_data_path("ref_output/left_grid.nc"), decode_cf=False
+    ) as left_grid_ref:
+        assert np.allclose(left_grid_ref["x"].values, left_grid[:, :, 0])
+        assert np.allclose(left_grid_ref["y"].values, left_grid[:, :, 1])
 
     # Uncomment to update baseline
     # right_grid.to_netcdf(absolute_data_path("ref_output/right_grid.nc"))
 
-    right_grid_ref = xr.open_dataset(
-        absolute_data_path("ref_output/right_grid.nc")
-    )
-    assert np.allclose(right_grid_ref["x"].values, right_grid[:, :, 0])
-    assert np.allclose(right_grid_ref["y"].values, right_grid[:, :, 1])
+    with xr.open_dataset(
+        absolute_data_path("ref_output/right_grid.nc"), decode_cf=False
+    ) as right_grid_ref:
+        assert np.allclose(right_grid_ref["x"].values, right_grid[:, :, 0])
+        assert np.allclose(right_grid_ref["y"].values, right_grid[:, :, 1])
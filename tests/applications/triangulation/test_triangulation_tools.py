@@ -119,3 +119,37 @@ def test_geoid_offset():
     assert np.allclose(
         geoid_ref.z.values, computed_geoid.z.values, atol=1e-3, rtol=1e-12
     )
+
+
+@pytest.mark.unit_tests
+def test_geoid_offset_outside_geoid():
+    """
+    Test points outside a regional geoid grid get NaN elevations
+    """
+    geoid = xr.Dataset(
+        {
+            "hgt": (
+                ("lat", "lon"),
+                np.arange(30, dtype=np.float32).reshape(5, 6),
+            )
+        },
+        coords={
+            "lat": np.linspace(50, 40, 5),
+            "lon": np.linspace(0, 10, 6),
+        },
+        attrs={"lat_min": 40, "lat_max": 50, "lon_min": 0, "lon_max": 10},
+    )
+
+    points = xr.Dataset(
+        {
+            cst.X: ((cst.ROW, cst.COL), np.array([[5.0, 10.0, 20.0]])),
+            cst.Y: ((cst.ROW, cst.COL), np.array([[45.0, 45.0, 45.0]])),
+            cst.Z: ((cst.ROW, cst.COL), np.zeros((1, 3))),
+        }
+    )
+
+    computed_geoid = triangulation_tools.geoid_offset(points, geoid)
+
+    np.testing.assert_allclose(
+        computed_geoid[cst.Z].values, [[-14.5, -17.0, np.nan]]
+    )
@@ -66,6 +66,13 @@ def test_carsmask_is_multiclasses_mask():
 
     assert is_mc_mask is False
 
+    no_class_msk = np.full((3, 3), mask_classes.VALID_VALUE, dtype=np.uint16)
+    no_class_msk[0, 0] = mask_classes.NO_DATA_IN_EPIPOLAR_RECTIFICATION
+
+    is_mc_mask = mask_classes.is_multiclasses_mask(no_class_msk)
+
+    assert is_mc_mask is False
+
 
 @pytest.mark.unit_tests
 def test_get_msk_from_classes():
@@ -111,3 +118,19 @@ def test_get_msk_from_classes():
     )
 
     assert np.allclose(out_msk, ref_msk)
+
+    # test intern no data masking
+    mc_msk[0, 0] = mask_classes.NO_DATA_IN_EPIPOLAR_RECTIFICATION
+    out_msk = mask_classes.create_msk_from_classes(
+        mc_msk,
+        classes_to_use_for_msk,
+        out_msk_dtype=bool,
+        mask_intern_no_data_val=True,
+    )
+
+    ref_msk = np.array(
+        [[True, False, False], [True, False, True], [False, True, True]],
+        dtype=bool,
+    )
+
+    assert np.allclose(out_msk, ref_msk)
@@ -36,27 +36,16 @@ from cars.core.geometry import (  # noqa;  isort:skip; pylint: disable=wrong-imp
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def epipolar_coords():
     """
     inputs for the test_matches_to_sensor_coords and
     test_sensor_position_from_grid tests
     """
-    left_epipolar_coords = np.array(
-        [
-            [0.0, 0.0],
-            [1.0, 0.0],
-            [2.0, 0.0],
-            [3.0, 0.0],
-            [0.0, 1.0],
-            [1.0, 1.0],
-            [2.0, 1.0],
-            [3.0, 1.0],
-            [0.0, 2.0],
-            [1.0, 2.0],
-            [2.0, 2.0],
-            [3.0, 2.0],
-        ]
+    # Regular 4x3 grid of (x, y) positions, row by row
+    epi_pos_x, epi_pos_y = np.meshgrid(np.arange(4.0), np.arange(3.0))
+    left_epipolar_coords = np.column_stack(
+        (epi_pos_x.ravel(), epi_pos_y.ravel())
     )
 
     right_epipolar_coords = np.array(
@@ -73,7 +62,8 @@ def epipolar_coords():
             [10.0, 2.0],
             [12.0, 2.0],
             [14.0, 2.0],
-        ]
+        ],
+        dtype=np.float64,
     )
 
     out_dict = {
@@ -81,10 +71,14 @@ def epipolar_coords():
         "right": right_epipolar_coords,
     }
 
+    # Arrays are shared by module tests: forbid their modification
+    for coords in out_dict.values():
+        coords.setflags(write=False)
+
     return out_dict
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def ref_sensor_coords():
     """
     expected results for the test_matches_to_sensor_coords,
@@ -127,6 +121,10 @@ def ref_sensor_coords():
         "left": left_sensor_coords,
         "right": right_sensor_coords,
     }
+
+    # Arrays are shared by module tests: forbid their modification
+    for coords in out_dict.values():
+        coords.setflags(write=False)
     return out_dict
 
 
@@ -200,32 +198,23 @@ def test_disp_to_sensor_coords(
         grid1, grid2, disp_map, cst.DISP_MODE, matches_msk=disp_msk
     )
 
-    ref_sensor_pos_left_x = np.copy(ref_sensor_coords["left"][:, 0])
-    ref_sensor_pos_left_y = np.copy(ref_sensor_coords["left"][:, 1])
-    ref_sensor_pos_left_x = ref_sensor_pos_left_x.reshape((nb_row, nb_col))
-    ref_sensor_pos_left_y = ref_sensor_pos_left_y.reshape((nb_row, nb_col))
-    ref_sensor_pos_left_x[np.where(disp_msk != 255)] = np.nan
-    ref_sensor_pos_left_y[np.where(disp_msk != 255)] = np.nan
+    # Invalid matches are expected to be set to nan, on both coordinates
+    invalid_msk = disp_msk != 255
+    ref_sensor_pos_left = ref_sensor_coords["left"].reshape((nb_row, nb_col, 2))
+    ref_sensor_pos_left = np.copy(ref_sensor_pos_left)
+    ref_sensor_pos_left[invalid_msk] = np.nan
 
-    assert np.allclose(
-        sensor_pos_left[:, :, 0], ref_sensor_pos_left_x, equal_nan=True
+    ref_sensor_pos_right = ref_sensor_coords["right"].reshape(
+        (nb_row, nb_col, 2)
     )
-    assert np.allclose(
-        sensor_pos_left[:, :, 1], ref_sensor_pos_left_y, equal_nan=True
-    )
-
-    ref_sensor_pos_right_x = np.copy(ref_sensor_coords["right"][:, 0])
-    ref_sensor_pos_right_y = np.copy(ref_sensor_coords["right"][:, 1])
-    ref_sensor_pos_right_x = ref_sensor_pos_right_x.reshape((nb_row, nb_col))
-    ref_sensor_pos_right_y = ref_sensor_pos_right_y.reshape((nb_row, nb_col))
-    ref_sensor_pos_right_x[np.where(disp_msk != 255)] = np.nan
-    ref_sensor_pos_right_y[np.where(disp_msk != 255)] = np.nan
+    ref_sensor_pos_right = np.copy(ref_sensor_pos_right)
+    ref_sensor_pos_right[invalid_msk] = np.nan
 
+    # Check both coordinates of left and right positions at once
     assert np.allclose(
-        sensor_pos_right[:, :, 0], ref_sensor_pos_right_x, equal_nan=True
-    )
-    assert np.allclose(
-        sensor_pos_right[:, :, 1], ref_sensor_pos_right_y, equal_nan=True
+        np.stack((sensor_pos_left, sensor_pos_right)),
+        np.stack((ref_sensor_pos_left, ref_sensor_pos_right)),
+        equal_nan=True,
     )
 
     # test with a cropped disparity map (ul_corner is expressed as (X,Y))
@@ -245,31 +234,17 @@ def test_disp_to_sensor_coords(
         ul_matches_shift=ul_corner_crop,
     )
 
-    ref_sensor_pos_left_x = ref_sensor_pos_left_x[
+    ref_sensor_pos_left = ref_sensor_pos_left[
         ul_corner_crop[1] : nb_row, ul_corner_crop[0] : nb_col
     ]
-    ref_sensor_pos_left_y = ref_sensor_pos_left_y[
+    ref_sensor_pos_right = ref_sensor_pos_right[
         ul_corner_crop[1] : nb_row, ul_corner_crop[0] : nb_col
     ]
 
     assert np.allclose(
-        sensor_pos_left[:, :, 0], ref_sensor_pos_left_x, equal_nan=True
-    )
-    assert np.allclose(
-        sensor_pos_left[:, :, 1], ref_sensor_pos_left_y, equal_nan=True
-    )
-
-    ref_sensor_pos_right_x = ref_sensor_pos_right_x[
-        ul_corner_crop[1] : nb_row, ul_corner_crop[0] : nb_col
-    ]
-    ref_sensor_pos_right_y = ref_sensor_pos_right_y[
-        ul_corner_crop[1] : nb_row, ul_corner_crop[0] : nb_col
-    ]
-    assert np.allclose(
-        sensor_pos_right[:, :, 0], ref_sensor_pos_right_x, equal_nan=True
-    )
-    assert np.allclose(
-        sensor_pos_right[:, :, 1], ref_sensor_pos_right_y, equal_nan=True
+        np.stack((sensor_pos_left, sensor_pos_right)),
+        np.stack((ref_sensor_pos_left, ref_sensor_pos_right)),
+        equal_nan=True,
     )
 
 
@@ -52,6 +52,11 @@ def test_grid():
     grid = tiling.grid(0, 0, 500, 400, 90, 90)
     assert grid.shape == (6, 7, 2)
 
+    # fill a preallocated grid
+    out_grid = np.zeros((6, 7, 2))
+    assert tiling.grid(0, 0, 500, 400, 90, 90, out=out_grid) is out_grid
+    np.testing.assert_array_equal(out_grid, grid)
+
 
 @pytest.mark.unit_tests
 def test_split():
@@ -72,7 +77,7 @@ def test_crop():
 
     cropped = tiling.crop(region1, region2)
 
-    assert cropped == [50, 0, 100, 80]
+    assert cropped == (50, 0, 100, 80)
 
 
 @pytest.mark.unit_tests
@@ -84,7 +89,7 @@ def test_pad():
     region = [1, 2, 3, 4]
     margin = [5, 6, 7, 8]
 
-    assert tiling.pad(region, margin) == [-4, -4, 10, 12]
+    assert tiling.pad(region, margin) == (-4, -4, 10, 12)
 
 
 @pytest.mark.unit_tests
@@ -155,6 +160,24 @@ def test_list_tiles():
     ]
 
 
+@pytest.mark.unit_tests
+def test_list_tiles_cache():
+    """
+    Test list_tiles results are not altered by callers through the cache
+    """
+    region = [45, 65, 55, 75]
+    largest_region = [0, 0, 100, 100]
+    tile_size = 10
+
+    tiles = tiling.list_tiles(region, largest_region, tile_size, margin=0)
+    tiles[0]["tile"][0] = -1
+    del tiles[1]["tile"]
+
+    tiles = tiling.list_tiles(region, largest_region, tile_size, margin=0)
+    assert tiles[0] == {"idx": 4, "idy": 6, "tile": [40, 60, 50, 70]}
+    assert tiles[1] == {"idx": 4, "idy": 7, "tile": [40, 70, 50, 80]}
+
+
 @pytest.mark.unit_tests
 def test_roi_to_start_and_size():
     """
@@ -275,8 +298,7 @@ def test_tiles_pairing(
 
     list_points_clouds_left = [pc_left]
     list_points_clouds_right = [pc_right]
-    list_epipolar_points_min = [points_min]
-    list_epipolar_points_max = [points_max]
+    epipolar_points = tiling.stack_epipolar_points([points_min], [points_max])
 
     # get epipolar tiles corresponding to the terrain grid for tile [0,0]
     (
@@ -291,8 +313,7 @@ def test_tiles_pairing(
         0,
         list_points_clouds_left,
         list_points_clouds_right,
-        list_epipolar_points_min,
-        list_epipolar_points_max,
+        epipolar_points,
     )
 
     def create_region_from_grid(id_x, id_y, epi_grid):
@@ -336,6 +357,41 @@ def test_tiles_pairing(
                 pass
 
 
+@pytest.mark.unit_tests
+def test_build_spatial_structures():
+    """
+    Test prebuilt spatial structures give the same epipolar positions
+    """
+    epipolar_regions_grid = tiling.grid(0, 0, 10, 10, 1, 1)
+    epipolar_grid_min = epipolar_regions_grid.reshape(-1, 2)
+    epipolar_grid_max = epipolar_grid_min + 0.5
+    terrain_grid = tiling.grid(-1, -1, 11, 11, 0.7, 0.7)
+    epsg = 32631
+
+    structures = tiling.build_spatial_structures(
+        epipolar_grid_min, epipolar_grid_max, epsg
+    )
+    assert len(structures) == 4
+
+    points = tiling.terrain_grid_to_epipolar(
+        terrain_grid,
+        epipolar_regions_grid,
+        epipolar_grid_min,
+        epipolar_grid_max,
+        epsg,
+    )
+    points_prebuilt = tiling.terrain_grid_to_epipolar(
+        terrain_grid,
+        epipolar_regions_grid,
+        epipolar_grid_min,
+        epipolar_grid_max,
+        epsg,
+        spatial_structures=structures,
+    )
+    for pos, pos_prebuilt in zip(points, points_prebuilt):
+        np.testing.assert_array_equal(pos, pos_prebuilt)
+
+
 @pytest.mark.unit_tests
 def test_filter_simplices_on_the_edges():
     """
@@ -368,3 +424,9 @@ def test_filter_simplices_on_the_edges():
     (diff_indexes,) = np.where(original_simplices != simplices)
     assert diff_indexes.tolist() == [4]
     assert simplices[4] == -1
+
+    # edges mask flags the simplex of the filtered point only
+    edges = tiling.get_simplices_on_the_edges(epipolar_grid_shape, tri)
+    assert edges.shape == (tri.simplices.shape[0],)
+    assert edges[original_simplices[4]]
+    assert not np.any(edges[original_simplices[:3]])
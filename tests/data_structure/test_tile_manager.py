@@ -29,9 +29,11 @@ import os
 import tempfile
 
 import numpy as np
+import pandas
 
 # Third party imports
 import pytest
+import xarray as xr
 
 # CARS imports
 from cars.data_structures import cars_dataset
@@ -62,6 +64,77 @@ def test_save_load_numpy_array():
         np.testing.assert_allclose(array, new_array)
 
 
+@pytest.mark.unit_tests
+def test_save_load_object_with_buffers():
+    """
+    Test save_object_with_buffers and load_object_with_buffers
+    """
+
+    dataset = xr.Dataset(
+        {
+            "im": (["row", "col"], np.random.rand(5, 4)),
+            "msk": (["row", "col"], np.zeros((5, 4), dtype=np.uint16)),
+        },
+        coords={"row": np.arange(5), "col": np.arange(4)},
+        attrs={"region": (0, 0, 4, 5)},
+    )
+    dataframe = pandas.DataFrame(
+        {"x": np.random.rand(6), "y": np.arange(6), "name": ["a"] * 6}
+    )
+
+    with tempfile.TemporaryDirectory(dir=temporary_dir()) as directory:
+
+        dataset_path = os.path.join(directory, "dataset")
+        dataframe_path = os.path.join(directory, "dataframe")
+
+        # save objects
+        cars_dataset.save_object_with_buffers(dataset, dataset_path)
+        cars_dataset.save_object_with_buffers(dataframe, dataframe_path)
+
+        # load objects
+        new_dataset = cars_dataset.load_object_with_buffers(dataset_path)
+        new_dataframe = cars_dataset.load_object_with_buffers(dataframe_path)
+
+        # assert same objects
+        xr.testing.assert_identical(dataset, new_dataset)
+        pandas.testing.assert_frame_equal(dataframe, new_dataframe)
+
+        # loaded arrays are writable without modifying saved files
+        new_dataset["im"].values[0, 0] = -1
+        new_dataframe.loc[0, "x"] = -1
+        np.testing.assert_allclose(
+            cars_dataset.load_object_with_buffers(dataset_path)["im"].values,
+            dataset["im"].values,
+        )
+
+
+@pytest.mark.unit_tests
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/fd"), reason="open fds can not be listed"
+)
+def test_load_object_with_buffers_open_fds():
+    """
+    Test loaded objects do not keep their files open
+    """
+
+    dataset = xr.Dataset({"im": (["row", "col"], np.random.rand(5, 4))})
+
+    with tempfile.TemporaryDirectory(dir=temporary_dir()) as directory:
+
+        dataset_path = os.path.join(directory, "dataset")
+        cars_dataset.save_object_with_buffers(dataset, dataset_path)
+
+        nb_open_fds = len(os.listdir("/proc/self/fd"))
+        loaded_datasets = [
+            cars_dataset.load_object_with_buffers(dataset_path)
+            for _ in range(300)
+        ]
+        assert len(os.listdir("/proc/self/fd")) == nb_open_fds
+
+        for loaded_dataset in loaded_datasets:
+            xr.testing.assert_identical(dataset, loaded_dataset)
+
+
 @pytest.mark.unit_tests
 def test_save_load_dict():
     """
@@ -26,11 +26,13 @@ organized functionnally.
 TODO: add conftest.py general tests conf with tests refactor.
 """
 
+import copy
 import json
 import logging
 
 # Standard imports
 import os
+from functools import lru_cache
 
 # Third party imports
 import numpy as np
@@ -56,7 +58,7 @@ from cars.pipelines.sensor_to_full_resolution_dsm import sensors_inputs
 # Specific values
 # 0 = valid pixels
 # 255 = value used as no data during the resampling in the epipolar geometry
-PROTECTED_VALUES = [255]
+PROTECTED_VALUES = frozenset([255])
 
 
 def cars_path():
@@ -67,6 +69,31 @@ def cars_path():
     return os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
 
+@lru_cache(maxsize=None)
+def load_checked_input_json(input_json):
+    """
+    Load a partially filled input.json and check its inputs, transforming
+    relative paths to absolute paths. Done once per input json: callers
+    must copy the returned config before modifying it
+
+    :param input_json: input json
+    :type input_json: str
+
+    :return: input config, with checked inputs
+    :rtype: dict
+    """
+    json_dir_path = os.path.dirname(input_json)
+    with open(input_json, "r", encoding="utf8") as fstream:
+        config = json.load(fstream)
+
+    # transform paths
+    config["inputs"] = sensors_inputs.sensors_check_inputs(
+        config["inputs"], config_json_dir=json_dir_path
+    )
+
+    return config
+
+
 def generate_input_json(
     input_json,
     out_dir,
@@ -93,10 +120,8 @@ def generate_input_json(
     :return: path of generated json, dict input config
     :rtype: str, dict
     """
-    # Load dict
-    json_dir_path = os.path.dirname(input_json)
-    with open(input_json, "r", encoding="utf8") as fstream:
-        config = json.load(fstream)
+    # Load dict, with checked inputs
+    config = copy.deepcopy(load_checked_input_json(input_json))
 
     # Overload orchestrator
     config["orchestrator"] = {"mode": orchestrator_mode}
@@ -112,18 +137,12 @@ def generate_input_json(
     if "applications" not in config:
         config["applications"] = {}
 
-    # transform paths
-    new_config = config.copy()
-    new_config["inputs"] = sensors_inputs.sensors_check_inputs(
-        new_config["inputs"], config_json_dir=json_dir_path
-    )
-
     # dump json
     new_json_path = os.path.join(out_dir, "new_input.json")
     with open(new_json_path, "w", encoding="utf8") as fstream:
-        json.dump(new_config, fstream, indent=2)
+        json.dump(config, fstream, indent=2)
 
-    return new_json_path, new_config
+    return new_json_path, config
 
 
 def absolute_data_path(data_path):
@@ -159,44 +178,44 @@ def assert_same_images(actual, expected, rtol=0, atol=0):
     """
     Compare two image files with assertion:
     * same height, width, transform, crs
-    * assert_allclose() on numpy buffers
+    * assert_allclose() on numpy buffers, block by block, stopping at the
+      first differing block
     """
     with rio.open(actual) as rio_actual:
         with rio.open(expected) as rio_expected:
             np.testing.assert_equal(rio_actual.width, rio_expected.width)
             np.testing.assert_equal(rio_actual.height, rio_expected.height)
+            np.testing.assert_equal(rio_actual.count, rio_expected.count)
             assert rio_actual.transform == rio_expected.transform
             assert rio_actual.crs == rio_expected.crs
             assert rio_actual.nodata == rio_expected.nodata
-            np.testing.assert_allclose(
-                rio_actual.read(), rio_expected.read(), rtol=rtol, atol=atol
-            )
+            # Windows are read in both files, whatever their block layout
+            for _, window in rio_actual.block_windows(1):
+                np.testing.assert_allclose(
+                    rio_actual.read(window=window),
+                    rio_expected.read(window=window),
+                    rtol=rtol,
+                    atol=atol,
+                )
 
 
 def assert_same_datasets(actual, expected, rtol=0, atol=0):
     """
     Compare two datasets:
     """
-    assert (
-        list(actual.attrs.keys()).sort() == list(expected.attrs.keys()).sort()
-    )
+    assert sorted(actual.attrs.keys()) == sorted(expected.attrs.keys())
     for key in expected.attrs.keys():
         if isinstance(expected.attrs[key], np.ndarray):
             np.testing.assert_allclose(actual.attrs[key], expected.attrs[key])
         else:
             assert actual.attrs[key] == expected.attrs[key]
     assert actual.dims == expected.dims
-    assert (
-        list(actual.coords.keys()).sort() == list(expected.coords.keys()).sort()
-    )
+    assert sorted(actual.coords.keys()) == sorted(expected.coords.keys())
     for key in expected.coords.keys():
         np.testing.assert_allclose(
             actual.coords[key].values, expected.coords[key].values
         )
-    assert (
-        list(actual.data_vars.keys()).sort()
-        == list(expected.data_vars.keys()).sort()
-    )
+    assert sorted(actual.data_vars.keys()) == sorted(expected.data_vars.keys())
     for key in expected.data_vars.keys():
         np.testing.assert_allclose(
             actual[key].values, expected[key].values, rtol=rtol, atol=atol
@@ -207,18 +226,46 @@ def assert_same_dataframes(actual, expected, rtol=0, atol=0):
     """
     Compare two dataframes:
     """
-    assert (
-        list(actual.attrs.keys()).sort() == list(expected.attrs.keys()).sort()
-    )
+    assert sorted(actual.attrs.keys()) == sorted(expected.attrs.keys())
     for key in expected.attrs.keys():
         if isinstance(expected.attrs[key], np.ndarray):
             np.testing.assert_allclose(actual.attrs[key], expected.attrs[key])
         else:
             assert actual.attrs[key] == expected.attrs[key]
-    assert list(actual.keys()).sort() == list(expected.keys()).sort()
-    np.testing.assert_allclose(
-        actual.to_numpy(), expected.to_numpy(), rtol=rtol, atol=atol
-    )
+    assert sorted(actual.keys()) == sorted(expected.keys())
+    # Compare column by column, without copying frames to a single array
+    for key in expected.keys():
+        np.testing.assert_allclose(
+            actual[key].values,
+            expected[key].values,
+            rtol=rtol,
+            atol=atol,
+            err_msg="column {}".format(key),
+        )
+
+
+def pad_with_margin(array, margin, nb_row, nb_col):
+    """
+    Pad array with zeros in margin, on its two last dimensions.
+    Output is written once: only margins are zeroed, not the whole array
+
+    :param array: array to pad, of shape ([nb_band,] row, col)
+    :param margin: margin [left, top, right, bottom]
+    :param nb_row: number of rows of padded array
+    :param nb_col: number of columns of padded array
+    :return: padded float64 array
+    """
+    new_array = np.empty(array.shape[:-2] + (nb_row, nb_col))
+
+    new_array[..., : margin[1], :] = 0
+    new_array[..., nb_row - margin[3] :, :] = 0
+    new_array[..., margin[1] : nb_row - margin[3], : margin[0]] = 0
+    new_array[..., margin[1] : nb_row - margin[3], nb_col - margin[2] :] = 0
+    new_array[
+        ..., margin[1] : nb_row - margin[3], margin[0] : nb_col - margin[2]
+    ] = array
+
+    return new_array
 
 
 def add_color(dataset, color_array, color_mask=None, margin=None):
@@ -244,17 +291,8 @@ def add_color(dataset, color_array, color_mask=None, margin=None):
         nb_col = color_array.shape[-1] + margin[0] + margin[2]
 
     # add color
+    new_color_array = pad_with_margin(color_array, margin, nb_row, nb_col)
     if len(color_array.shape) > 2:
-        nb_band = color_array.shape[0]
-        if margin is None:
-            new_color_array = color_array
-        else:
-            new_color_array = np.zeros([nb_band, nb_row, nb_col])
-            new_color_array[
-                :,
-                margin[1] : nb_row - margin[3],
-                margin[0] : nb_col - margin[2],
-            ] = color_array
         # multiple bands
         if cst.BAND not in new_dataset.dims:
             nb_bands = color_array.shape[0]
@@ -265,26 +303,14 @@ def add_color(dataset, color_array, color_mask=None, margin=None):
             dims=[cst.BAND, cst.ROW, cst.COL],
         )
     else:
-        if margin is None:
-            new_color_array = color_array
-        else:
-            new_color_array = np.zeros([nb_row, nb_col])
-            new_color_array[
-                margin[1] : nb_row - margin[3], margin[0] : nb_col - margin[2]
-            ] = color_array
         new_dataset[cst.EPI_COLOR] = xr.DataArray(
             new_color_array,
             dims=[cst.ROW, cst.COL],
         )
 
     if color_mask is not None:
-        new_color_mask = np.zeros([nb_row, nb_col])
-        new_color_mask[
-            margin[1] : nb_row - margin[3], margin[0] : nb_col - margin[2]
-        ] = color_mask
-
         new_dataset[cst.EPI_COLOR_MSK] = xr.DataArray(
-            new_color_mask,
+            pad_with_margin(color_mask, margin, nb_row, nb_col),
             dims=[cst.ROW, cst.COL],
         )
 
@@ -355,9 +381,9 @@ def read_mask_classes(mask_classes_path):
         classes_usage_dict = json.load(mask_classes_file)
 
     # check that required values are not protected for CARS internal usage
-    used_values = []
+    used_values = set()
     for key in classes_usage_dict.keys():
-        used_values.extend(classes_usage_dict[key])
+        used_values.update(classes_usage_dict[key])
 
     for i in PROTECTED_VALUES:
         if i in used_values: